@@ -0,0 +1,98 @@
+"""模型序列化、派生属性与内存占用的微基准
+
+用法: python benchmarks/bench_model.py
+"""
+
+import dataclasses
+from datetime import datetime
+from pathlib import Path
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+import nonebot
+
+nonebot.init(driver="~none")
+
+from nonebot_plugin_uninfo import Member, Role, Scene, SceneType, Session, SupportAdapter, SupportScope, User
+from nonebot_plugin_uninfo.model import ModelMixin
+
+
+def make_session() -> Session:
+    user = User("10", name="user", avatar="https://example.com/avatar.png")
+    return Session(
+        "123",
+        SupportAdapter.onebot11,
+        SupportScope.qq_client,
+        Scene("2", SceneType.CHANNEL_TEXT, name="channel", parent=Scene("3", SceneType.GUILD, name="guild")),
+        user,
+        member=Member(user, nick="nick", joined_at=datetime(2024, 1, 1), roles=[Role("admin", 10, "Admin")]),
+    )
+
+
+def bench(label: str, stmt, number: int = 20000):
+    seconds = min(timeit.repeat(stmt, number=number, repeat=5))
+    print(f"{label:<40} {seconds / number * 1e6:8.2f} us")
+
+
+def _unslotted(cls: type) -> type:
+    """构造与模型字段一致但不使用 __slots__ 的普通 dataclass，作为内存占用的对照"""
+    fields = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            fields.append((f.name, object, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            fields.append((f.name, object, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            fields.append((f.name, object))
+    return dataclasses.make_dataclass(f"Unslotted{cls.__name__}", fields)
+
+
+def bytes_per_instance(factory, count: int = 10000) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory(i) for i in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def bench_memory():
+    unslotted_user, unslotted_role, unslotted_member = map(_unslotted, (User, Role, Member))
+    joined_at = datetime(2024, 1, 1)
+    for label, user_cls, role_cls, member_cls in (
+        ("slotted", User, Role, Member),
+        ("unslotted", unslotted_user, unslotted_role, unslotted_member),
+    ):
+        size = bytes_per_instance(
+            lambda i, u=user_cls, r=role_cls, m=member_cls: m(
+                u(str(i), name="user"), nick="nick", joined_at=joined_at, roles=[r("admin", 10, "Admin")]
+            )
+        )
+        print(f"{f'Member + User + Role ({label})':<40} {size:8.1f} B")
+
+
+def main():
+    sess = make_session()
+    bench("dump() (asdict + json round trip)", lambda: ModelMixin.dump(sess))
+    bench("dump() (hand-written)", sess.dump)
+    bench("dump_json()", sess.dump_json)
+    bench("dump_json(indent=2)", lambda: sess.dump_json(indent=2))
+    bench("Session.load(dump)", lambda: Session.load(sess.dump()))
+    bench("Session.load_trusted(dump)", lambda: Session.load_trusted(sess.dump()))
+
+    frozen = sess.freeze()
+    for label, target in (("mutable", sess), ("frozen", frozen)):
+        bench(f"id + basic + member.role ({label})", lambda t=target: (t.id, t.basic, t.member.role))
+        bench(f"scene_path ({label})", lambda t=target: t.scene_path)
+
+    bench_memory()
+
+
+if __name__ == "__main__":
+    main()
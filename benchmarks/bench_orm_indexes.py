@@ -0,0 +1,110 @@
+"""查找索引的基准：在 SQLite 中写入 100 万条会话，比较有无索引时的常用查询耗时
+
+用法: python benchmarks/bench_orm_indexes.py [会话数量]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+import nonebot
+
+nonebot.init(driver="~none", log_level="WARNING")
+nonebot.require("nonebot_plugin_orm")
+nonebot.require("nonebot_plugin_uninfo")
+
+from sqlalchemy import Engine, Index, create_engine, insert, select
+
+from nonebot_plugin_uninfo.orm import BotModel, SceneModel, SessionModel, UserModel
+
+SCENES_PER_GUILD = 10
+SCENES = 100_000
+USERS = 100_000
+LOOKUPS = 200
+_INDEXES: list[Index] = [
+    index
+    for table in (SceneModel.__table__, SessionModel.__table__)
+    for index in table.indexes  # type: ignore
+    if index.name != "nonebot_plugin_uninfo_index_session_last_seen"
+]
+
+
+def seed(engine: Engine, sessions: int):
+    tables = [model.__table__ for model in (BotModel, SceneModel, UserModel, SessionModel)]
+    BotModel.metadata.create_all(engine, tables=tables)  # type: ignore
+    with engine.begin() as conn:
+        conn.execute(insert(BotModel), [{"id": 1, "self_id": "123", "adapter": "OneBot V11", "scope": "QQClient"}])
+        conn.execute(
+            insert(SceneModel),
+            [
+                {
+                    "id": i,
+                    "bot_persist_id": 1,
+                    # 每个频道服务器下挂 SCENES_PER_GUILD - 1 个子频道
+                    "parent_scene_persist_id": None if i % SCENES_PER_GUILD == 1 else i - (i - 1) % SCENES_PER_GUILD,
+                    "scene_id": str(i),
+                    "scene_type": 3 if i % SCENES_PER_GUILD == 1 else 4,
+                    "scene_data": {},
+                }
+                for i in range(1, SCENES + 1)
+            ],
+        )
+        conn.execute(
+            insert(UserModel),
+            [{"id": i, "bot_persist_id": 1, "user_id": str(i), "user_data": {}} for i in range(1, USERS + 1)],
+        )
+        for start in range(0, sessions, 100_000):
+            conn.execute(
+                insert(SessionModel),
+                [
+                    {
+                        "bot_persist_id": 1,
+                        "scene_persist_id": i % SCENES + 1,
+                        "user_persist_id": (i // SCENES) * (USERS // 10) + i % (USERS // 10) + 1,
+                        "member_data": None,
+                        "last_seen": 0,
+                    }
+                    for i in range(start, min(start + 100_000, sessions))
+                ],
+            )
+
+
+def bench(engine: Engine):
+    queries = {
+        "sessions by user": lambda i: select(SessionModel.id).where(SessionModel.user_persist_id == i % USERS + 1),
+        "sessions by scene": lambda i: select(SessionModel.id).where(SessionModel.scene_persist_id == i % SCENES + 1),
+        "child scenes by parent": lambda i: select(SceneModel.id).where(
+            SceneModel.parent_scene_persist_id == (i * SCENES_PER_GUILD) % SCENES + 1
+        ),
+        "session by natural key": lambda i: select(SessionModel.id).where(
+            SessionModel.bot_persist_id == 1,
+            SessionModel.scene_persist_id == i % SCENES + 1,
+            SessionModel.user_persist_id == i % (USERS // 10) + 1,
+        ),
+    }
+    with engine.connect() as conn:
+        for label, query in queries.items():
+            start = time.perf_counter()
+            for i in range(LOOKUPS):
+                conn.execute(query(i * 7919)).all()
+            print(f"{label:<28} {(time.perf_counter() - start) / LOOKUPS * 1e3:8.3f} ms")
+
+
+def main(sessions: int):
+    engine = create_engine(f"sqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}")
+    start = time.perf_counter()
+    seed(engine, sessions)
+    print(f"seeded {sessions} sessions in {time.perf_counter() - start:.1f} s")
+    print("with lookup indexes:")
+    bench(engine)
+    for index in _INDEXES:
+        index.drop(engine)
+    print("without lookup indexes:")
+    bench(engine)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
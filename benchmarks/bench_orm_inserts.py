@@ -0,0 +1,60 @@
+"""并发插入的基准：大量协程同时首次写入互不相同的用户
+
+用法: python benchmarks/bench_orm_inserts.py [用户数量] [并发数]
+"""
+
+import asyncio
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+import nonebot
+
+nonebot.init(
+    driver="~none",
+    log_level="WARNING",
+    sqlalchemy_database_url=f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'bench.db'}",
+    alembic_startup_check=False,
+)
+
+nonebot_plugin_orm = nonebot.require("nonebot_plugin_orm")
+nonebot.require("nonebot_plugin_uninfo")
+
+from nonebot_plugin_uninfo import SupportAdapter, SupportScope, User, orm
+
+BASIC = {"self_id": "123", "adapter": SupportAdapter.onebot11, "scope": SupportScope.qq_client}
+
+
+async def _unsupported(*args, **kwargs):
+    return None
+
+
+async def insert_users(prefix: str, count: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _insert(i: int):
+        async with semaphore:
+            await orm.get_user_persist_id(BASIC, User(f"{prefix}{i}", name=f"user{i}"))  # type: ignore
+
+    orm.clear_persist_id_cache()
+    start = time.perf_counter()
+    await asyncio.gather(*(_insert(i) for i in range(count)))
+    return time.perf_counter() - start
+
+
+async def main(count: int, concurrency: int):
+    await nonebot_plugin_orm.init_orm()
+
+    print(f"{'upsert':<20} {await insert_users('u', count, concurrency):8.2f} s")
+    upsert, orm._upsert = orm._upsert, _unsupported
+    try:
+        print(f"{'select + insert':<20} {await insert_users('f', count, concurrency):8.2f} s")
+    finally:
+        orm._upsert = upsert
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000, int(sys.argv[2]) if len(sys.argv) > 2 else 200))
@@ -5,6 +5,13 @@ from .constraint import SupportAdapter as SupportAdapter
 from .constraint import SupportAdapterModule
 from .constraint import SupportScope as SupportScope
 from .fetch import InfoFetcher as InfoFetcher
+from .lifecycle import release_bot_cache as release_bot_cache
+from .model import FrozenMember as FrozenMember
+from .model import FrozenMuteInfo as FrozenMuteInfo
+from .model import FrozenRole as FrozenRole
+from .model import FrozenScene as FrozenScene
+from .model import FrozenSession as FrozenSession
+from .model import FrozenUser as FrozenUser
 from .model import Member as Member
 from .model import MuteInfo as MuteInfo
 from .model import Role as Role
@@ -13,18 +20,25 @@ from .model import SceneType as SceneType
 from .model import Session as Session
 from .model import User as User
 from .params import Interface as Interface
+from .params import LazySession as LazySession
 from .params import QryItrface as QryItrface
 from .params import QueryInterface as QueryInterface
 from .params import UniSession as UniSession
+from .params import UniSessionLazy as UniSessionLazy
+from .params import UniSessionShallow as UniSessionShallow
 from .params import Uninfo as Uninfo
 from .params import get_interface as get_interface
+from .params import get_lazy_session as get_lazy_session
 from .params import get_session as get_session
+from .params import get_shallow_session as get_shallow_session
 from .permission import ADMIN as ADMIN
 from .permission import GROUP as GROUP
 from .permission import GUILD as GUILD
 from .permission import MEMBER as MEMBER
 from .permission import OWNER as OWNER
 from .permission import PRIVATE as PRIVATE
+from .permission import Perm as Perm
+from .permission import PermExpr as PermExpr
 from .permission import ROLE_IN as ROLE_IN
 from .permission import ROLE_LEVEL as ROLE_LEVEL
 from .permission import ROLE_NOT_IN as ROLE_NOT_IN
@@ -32,6 +46,12 @@ from .permission import SCENE_IN as SCENE_IN
 from .permission import SCENE_NOT_IN as SCENE_NOT_IN
 from .permission import USER_IN as USER_IN
 from .permission import USER_NOT_IN as USER_NOT_IN
+from .prefetch import prefetch_session as prefetch_session
+from .snapshot import dump_snapshot as dump_snapshot
+from .snapshot import load_snapshot as load_snapshot
+from .table import MemberRow as MemberRow
+from .table import MemberTable as MemberTable
+from .warmup import start_warmup as start_warmup
 
 __plugin_meta__ = PluginMetadata(
     name="通用信息",
@@ -560,3 +560,28 @@ async def _(bot: Bot, event: Event):
         }
         return base
     raise NotImplementedError
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: DirectMessageCreateEvent | GuildMessageCreateEvent | DirectMessageUpdateEvent | GuildMessageUpdateEvent,
+):
+    if is_unset(event.author):
+        raise NotImplementedError
+    user_id = str(event.author.id)
+    if not isinstance(event.guild_id, Snowflake):
+        return {
+            "user_id": user_id,
+            "scene_id": user_id,
+            "scene_type": SceneType.PRIVATE,
+        }
+    guild_id = str(event.guild_id)
+    channel_id = str(event.channel_id)
+    return {
+        "user_id": user_id,
+        "scene_id": channel_id,
+        "scene_type": fetcher.get_cached_channel_type(bot, channel_id, guild_id),
+        "parent_id": guild_id,
+        "parent_type": SceneType.GUILD,
+    }
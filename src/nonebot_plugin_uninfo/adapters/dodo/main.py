@@ -267,3 +267,23 @@ async def _(
         "joined_at": event.member.join_time,
     }
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PersonalMessageEvent):
+    return {
+        "user_id": event.dodo_source_id,
+        "scene_id": event.dodo_source_id,
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: ChannelMessageEvent):
+    return {
+        "user_id": event.dodo_source_id,
+        "scene_id": event.channel_id,
+        "scene_type": fetcher.get_cached_channel_type(bot, event.channel_id, event.island_source_id),
+        "parent_id": event.island_source_id,
+        "parent_type": SceneType.GUILD,
+    }
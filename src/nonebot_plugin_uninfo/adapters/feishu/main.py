@@ -286,3 +286,22 @@ async def _(bot: Bot, event: GroupMessageEvent | PrivateMessageEvent):
         except ActionFailed:
             pass
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PrivateMessageEvent):
+    user_id = event.event.sender.sender_id.open_id
+    return {
+        "user_id": user_id,
+        "scene_id": user_id,
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GroupMessageEvent):
+    return {
+        "user_id": event.event.sender.sender_id.open_id,
+        "scene_id": event.event.message.chat_id,
+        "scene_type": SceneType.GROUP,
+    }
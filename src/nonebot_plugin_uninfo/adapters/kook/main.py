@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 
 from nonebot.adapters.kaiheila import Bot
 from nonebot.adapters.kaiheila.api.model import Channel as KookChannel
-from nonebot.adapters.kaiheila.event import Event, HeartbeatMetaEvent, LifecycleMetaEvent
+from nonebot.adapters.kaiheila.event import Event, HeartbeatMetaEvent, LifecycleMetaEvent, MessageEvent
 
 from nonebot_plugin_uninfo.constraint import SupportAdapter, SupportScope
 from nonebot_plugin_uninfo.fetch import BasicInfo
@@ -321,3 +321,22 @@ async def _(bot: Bot, event: Event):
             "joined_at": datetime.fromtimestamp(member.joined_at / 1000) if member.joined_at else None,
         }
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: MessageEvent):
+    if event.channel_type == "PERSON":
+        return {
+            "user_id": event.user_id,
+            "scene_id": event.user_id,
+            "scene_type": SceneType.PRIVATE,
+        }
+    if not (guild_id := event.extra.guild_id):
+        raise NotImplementedError
+    return {
+        "user_id": event.user_id,
+        "scene_id": event.target_id,
+        "scene_type": fetcher.get_cached_channel_type(bot, event.target_id, guild_id),
+        "parent_id": guild_id,
+        "parent_type": SceneType.GUILD,
+    }
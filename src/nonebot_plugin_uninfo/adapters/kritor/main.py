@@ -487,3 +487,43 @@ async def _(bot: Bot, event: InvitedJoinGroupRequest):
         "group_id": event.group_id,
         "group_name": group_name,
     }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: FriendMessage | StrangerMessage | NearbyMessage):
+    return {
+        "user_id": str(event.sender.uin),
+        "scene_id": str(event.sender.uin),
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GroupMessage):
+    return {
+        "user_id": str(event.sender.uin),
+        "scene_id": str(event.sender.group_id),
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: TempMessage):
+    return {
+        "user_id": str(event.sender.uin),
+        "scene_id": str(event.sender.uin),
+        "scene_type": SceneType.PRIVATE,
+        "parent_id": str(event.sender.group_id),
+        "parent_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GuildMessage):
+    return {
+        "user_id": str(event.sender.tiny_id),
+        "scene_id": str(event.sender.channel_id),
+        "scene_type": SceneType.CHANNEL_TEXT,
+        "parent_id": str(event.sender.guild_id),
+        "parent_type": SceneType.GUILD,
+    }
@@ -508,3 +508,19 @@ async def _(bot: Bot, evnet: MilkyEvent):
         "group_name": group.group_name,
     }
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: MessageEvent | GroupMessageEvent | FriendMessageEvent | TempMessageEvent):
+    if event.data.message_scene == "friend":
+        return {
+            "user_id": str(event.data.sender_id),
+            "scene_id": str(event.data.sender_id),
+            "scene_type": SceneType.PRIVATE,
+        }
+    assert event.data.group
+    return {
+        "user_id": str(event.data.sender_id),
+        "scene_id": str(event.data.group.group_id),
+        "scene_type": SceneType.GROUP,
+    }
@@ -647,3 +647,21 @@ async def _(bot: Bot, event: MemberJoinRequestEvent | BotInvitedJoinGroupRequest
         "user_id": str(event.supplicant),
         "name": event.nickname,
     }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: FriendMessage | StrangerMessage):
+    return {
+        "user_id": str(event.sender.id),
+        "scene_id": str(event.sender.id),
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GroupMessage | TempMessage):
+    return {
+        "user_id": str(event.sender.id),
+        "scene_id": str(event.group.id),
+        "scene_type": SceneType.GROUP,
+    }
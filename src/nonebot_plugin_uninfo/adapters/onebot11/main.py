@@ -439,3 +439,49 @@ async def _(
             "gender": operator_info.get("sex", "unknown"),
         },
     }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PrivateMessageEvent | FriendAddNoticeEvent | FriendRecallNoticeEvent | FriendRequestEvent):
+    return {
+        "user_id": str(event.user_id),
+        "scene_id": str(event.user_id),
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: (
+        GroupMessageEvent
+        | GroupUploadNoticeEvent
+        | GroupAdminNoticeEvent
+        | GroupRequestEvent
+        | HonorNotifyEvent
+        | GroupDecreaseNoticeEvent
+        | GroupIncreaseNoticeEvent
+        | GroupRecallNoticeEvent
+        | GroupBanNoticeEvent
+    ),
+):
+    return {
+        "user_id": str(event.user_id),
+        "scene_id": str(event.group_id),
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PokeNotifyEvent):
+    if not event.group_id:
+        return {
+            "user_id": str(event.user_id),
+            "scene_id": str(event.user_id),
+            "scene_type": SceneType.PRIVATE,
+        }
+    return {
+        "user_id": str(event.target_id),
+        "scene_id": str(event.group_id),
+        "scene_type": SceneType.GROUP,
+    }
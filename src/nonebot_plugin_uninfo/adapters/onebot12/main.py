@@ -390,3 +390,67 @@ async def _(
             "nickname": operator_info.get("user_displayname"),
         },
     }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: PrivateMessageDeleteEvent | PrivateMessageEvent | FriendDecreaseEvent | FriendIncreaseEvent,
+):
+    return {
+        "user_id": event.user_id,
+        "scene_id": event.user_id,
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: GroupMemberDecreaseEvent | GroupMemberIncreaseEvent | GroupMessageDeleteEvent | GroupMessageEvent,
+):
+    return {
+        "user_id": event.user_id,
+        "scene_id": event.group_id,
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: ChannelMemberDecreaseEvent | ChannelMemberIncreaseEvent | ChannelMessageDeleteEvent | ChannelMessageEvent,
+):
+    return {
+        "user_id": event.user_id,
+        "scene_id": event.channel_id,
+        "scene_type": SceneType.CHANNEL_TEXT,
+        "parent_id": event.guild_id,
+        "parent_type": SceneType.GUILD,
+    }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: ChannelCreateEvent | ChannelDeleteEvent,
+):
+    return {
+        "user_id": event.operator_id,
+        "scene_id": event.channel_id,
+        "scene_type": SceneType.CHANNEL_TEXT,
+        "parent_id": event.guild_id,
+        "parent_type": SceneType.GUILD,
+    }
+
+
+@fetcher.supply_shallow
+def _(
+    bot: Bot,
+    event: GuildMemberDecreaseEvent | GuildMemberIncreaseEvent,
+):
+    return {
+        "user_id": event.user_id,
+        "scene_id": event.guild_id,
+        "scene_type": SceneType.GUILD,
+    }
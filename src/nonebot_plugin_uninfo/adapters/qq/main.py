@@ -459,3 +459,18 @@ async def _(bot: Bot, event: Event):
             pass
         return base
     raise NotImplementedError
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GuildMessageEvent):
+    if isinstance(event, DirectMessageCreateEvent):
+        scene_type = SceneType.PRIVATE
+    else:
+        scene_type = fetcher.get_cached_channel_type(bot, event.channel_id, event.guild_id)
+    return {
+        "user_id": event.author.id,
+        "scene_id": event.channel_id,
+        "scene_type": scene_type,
+        "parent_id": event.guild_id,
+        "parent_type": SceneType.GUILD,
+    }
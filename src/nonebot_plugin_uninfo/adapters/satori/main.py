@@ -307,3 +307,38 @@ async def _(bot: Bot, event: Event):
             "joined_at": None,
         }
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: Event):
+    user_id = event.user.id if event.user else bot.get_self_id()
+    plain = "guild.plain" in bot._self_info.features
+    if event.guild and event.channel:
+        if plain or event.guild.id == event.channel.id:
+            scene_type = parent_type = SceneType.GROUP
+        else:
+            scene_type, parent_type = TYPE_MAPPING[event.channel.type], SceneType.GUILD
+        return {
+            "user_id": user_id,
+            "scene_id": event.channel.id,
+            "scene_type": scene_type,
+            "parent_id": event.guild.id,
+            "parent_type": parent_type,
+        }
+    if event.guild:
+        return {
+            "user_id": user_id,
+            "scene_id": event.guild.id,
+            "scene_type": SceneType.GROUP if plain else SceneType.GUILD,
+        }
+    if event.channel:
+        return {
+            "user_id": user_id,
+            "scene_id": event.channel.id,
+            "scene_type": SceneType.GROUP if plain else TYPE_MAPPING[event.channel.type],
+        }
+    return {
+        "user_id": user_id,
+        "scene_id": user_id,
+        "scene_type": SceneType.PRIVATE,
+    }
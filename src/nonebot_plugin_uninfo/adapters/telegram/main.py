@@ -267,3 +267,50 @@ async def _(bot: Bot, event: CallbackQueryEvent):
         except ActionFailed:
             pass
     return base
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PrivateMessageEvent | PrivateEditedMessageEvent):
+    return {
+        "user_id": str(event.from_.id),
+        "scene_id": str(event.from_.id),
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GroupMessageEvent | GroupEditedMessageEvent):
+    return {
+        "user_id": str(event.from_.id),
+        "scene_id": str(event.chat.id),
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: ForumTopicMessageEvent | ForumTopicEditedMessageEvent):
+    return {
+        "user_id": str(event.from_.id),
+        "scene_id": str(event.message_thread_id),
+        "scene_type": SceneType.CHANNEL_TEXT,
+        "parent_id": str(event.chat.id),
+        "parent_type": SceneType.GUILD,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: LeftChatMemberEvent):
+    return {
+        "user_id": str(event.left_chat_member.id),
+        "scene_id": str(event.chat.id),
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: NewChatMemberEvent):
+    return {
+        "user_id": str(event.new_chat_members[0].id),
+        "scene_id": str(event.chat.id),
+        "scene_type": SceneType.GROUP,
+    }
@@ -249,3 +249,36 @@ async def _(bot: Bot, event: ButtonReportNoticeEvent):
         "name": group_info.get("name"),
         "groupAvatarUrl": group_info.get("groupAvatarUrl"),
     }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: PrivateMessageEvent):
+    return {
+        "user_id": event.event.sender.senderId,
+        "scene_id": event.event.sender.senderId,
+        "scene_type": SceneType.PRIVATE,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: GroupMessageEvent):
+    return {
+        "user_id": event.event.sender.senderId,
+        "scene_id": event.event.chat.chatId,
+        "scene_type": SceneType.GROUP,
+    }
+
+
+@fetcher.supply_shallow
+def _(bot: Bot, event: InstructionMessageEvent):
+    if event.event.chat.chatType == "group":
+        return {
+            "user_id": event.event.sender.senderId,
+            "scene_id": event.event.chat.chatId,
+            "scene_type": SceneType.GROUP,
+        }
+    return {
+        "user_id": event.event.sender.senderId,
+        "scene_id": event.event.sender.senderId,
+        "scene_type": SceneType.PRIVATE,
+    }
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic import BaseModel, Field
 
 
@@ -9,3 +11,62 @@ class Config(BaseModel):
 
     uninfo_cache_expire: int = Field(default=300, description="缓存过期时间")
     """缓存过期时间"""
+
+    uninfo_cache_release_delay: float = Field(default=60, description="机器人断开连接后释放其缓存的等待时间")
+    """机器人断开连接后释放其缓存的等待时间，单位为秒；在此期间重新连接则保留缓存"""
+
+    uninfo_cache_snapshot_dir: Path | None = Field(default=None, description="缓存快照的保存目录")
+    """缓存快照的保存目录，设置后将在启动时恢复、关闭时保存各适配器的缓存"""
+
+    uninfo_cache_frozen: bool = Field(default=False, description="是否以只读实例缓存会话、用户、场景与成员信息")
+    """是否以只读实例缓存会话、用户、场景与成员信息，开启后缓存的对象可安全共享"""
+
+    uninfo_intern: bool = Field(
+        default=False, description="是否对重复的用户、角色与场景对象进行去重共享，需同时开启 uninfo_cache_frozen"
+    )
+    """是否对重复的用户、角色与场景对象进行去重共享，需同时开启 uninfo_cache_frozen"""
+
+    uninfo_warmup: bool = Field(default=False, description="是否在机器人连接时预热缓存")
+    """是否在机器人连接时预热缓存"""
+
+    uninfo_warmup_members: int = Field(default=0, description="预热时拉取成员列表的最活跃场景数量")
+    """预热时拉取成员列表的最活跃场景数量，为 0 时仅拉取场景列表
+
+    活跃度仅在运行期间统计，不会持久化；启动后的首次预热按平台返回的场景顺序选取
+    """
+
+    uninfo_warmup_concurrency: int = Field(default=1, description="预热时同时拉取成员列表的场景数")
+    """预热时同时拉取成员列表的场景数"""
+
+    uninfo_warmup_interval: float = Field(default=1.0, description="预热的启动延迟与每次拉取成员列表后的等待时间")
+    """预热的启动延迟与每次拉取成员列表后的等待时间，单位为秒"""
+
+    uninfo_orm_cache_size: int = Field(default=4096, description="每张表缓存的持久化 id 数量")
+    """ORM 每张表缓存的 自然键 -> 持久化 id 数量，为 0 时不缓存"""
+
+    uninfo_orm_write_behind: bool = Field(default=False, description="是否在后台批量写入 ORM 数据的变更")
+    """是否在后台批量写入 ORM 数据的变更，开启后仅新建记录需要同步等待数据库"""
+
+    uninfo_orm_flush_interval: float = Field(default=0.5, description="后台批量写入的间隔")
+    """后台批量写入的间隔，单位为秒"""
+
+    uninfo_orm_flush_size: int = Field(default=500, description="触发立即写入的待写入记录数量")
+    """待写入的记录达到该数量时立即写入，不再等待写入间隔"""
+
+    uninfo_orm_last_seen_interval: int = Field(default=3600, description="会话最近出现时间的更新间隔")
+    """会话记录最近出现时间 (last_seen) 的最小更新间隔，单位为秒"""
+
+    uninfo_orm_gc_days: float | None = Field(default=None, description="清理多少天未出现的会话记录")
+    """定期删除超过该天数未出现的会话记录，为 None 时不清理"""
+
+    uninfo_orm_gc_interval: float = Field(default=86400, description="清理会话记录的间隔")
+    """清理会话记录的间隔，单位为秒"""
+
+    uninfo_prefetch: bool = Field(default=False, description="是否在事件预处理阶段提前获取会话信息")
+    """是否在事件预处理阶段提前获取会话信息"""
+
+    uninfo_prefetch_adapters: set[str] = Field(default_factory=set, description="启用预取的适配器名称，为空时不限制")
+    """启用预取的适配器名称，为空时不限制"""
+
+    uninfo_prefetch_event_types: set[str] = Field(default={"message"}, description="启用预取的事件类型")
+    """启用预取的事件类型，对应 `event.get_type()`"""
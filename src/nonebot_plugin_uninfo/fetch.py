@@ -1,21 +1,27 @@
 from abc import ABCMeta, abstractmethod
 import asyncio
-from collections import defaultdict
-from collections.abc import AsyncGenerator, Awaitable, Callable
+from collections import Counter
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
 from types import UnionType
 from typing import Any, TypeVar, Union, get_args, get_origin, get_type_hints
+import weakref
 
 from nonebot import get_plugin_config
 from nonebot.adapters import Bot, Event
+from nonebot.exception import AdapterException
 
 from .config import Config
-from .constraint import SupportAdapter
-from .model import BasicInfo, Member, Scene, SceneType, Session, User
+from .constraint import SupportAdapter, log
+from .model import BasicInfo, Member, ModelMixin, Scene, SceneType, Session, User
+from .pool import InternPool
 
 TE = TypeVar("TE", bound=Event)
 TB = TypeVar("TB", bound=Bot)
 Supplier = Callable[[TB, TE], Awaitable[dict]]
 TSupplier = TypeVar("TSupplier", bound=Supplier)
+ShallowSupplier = Callable[[TB, TE], dict]
+TShallowSupplier = TypeVar("TShallowSupplier", bound=ShallowSupplier)
+TModel = TypeVar("TModel", bound=ModelMixin)
 
 try:
     conf = get_plugin_config(Config)
@@ -28,28 +34,123 @@ class InfoFetcher(metaclass=ABCMeta):
         self.adapter = adapter
         self.endpoint: dict[type[Event], Callable[[Bot, Event], Awaitable[dict]]] = {}
         self.wildcard: Callable[[Bot, Event], Awaitable[dict]] | None = None
-        self.session_cache: dict[str, Session] = {}
-        self._timertasks = []
-        self._user_cache: defaultdict[str, dict[str, User]] = defaultdict(dict)
-        self._scene_cache: defaultdict[str, dict[tuple[int, str, str | None], Scene]] = defaultdict(dict)
-        self._member_cache: defaultdict[str, dict[tuple[int, str, str], Member]] = defaultdict(dict)
+        self.shallow_endpoint: dict[type[Event], Callable[[Bot, Event], dict]] = {}
+        self.session_cache: dict[str, dict[str, Session]] = {}
+        self._timertasks: dict[str, dict[tuple[str, Any], asyncio.TimerHandle]] = {}
+        # 共享实例必须是只读的，否则一处原地修改会影响所有持有者
+        self.pool: InternPool | None = InternPool() if conf.uninfo_intern and conf.uninfo_cache_frozen else None
+        self._event_tasks: dict[int, tuple[str, weakref.ref[Event], asyncio.Task[Session]]] = {}
+        self._user_cache: dict[str, dict[str, User]] = {}
+        self._scene_cache: dict[str, dict[tuple[int, str, str | None], Scene]] = {}
+        self._member_cache: dict[str, dict[tuple[int, str, str], Member]] = {}
+        self._activity: dict[str, Counter[tuple[int, str]]] = {}
+        self._caches: dict[str, dict[str, dict[Any, Any]]] = {
+            "session": self.session_cache,
+            "user": self._user_cache,
+            "scene": self._scene_cache,
+            "member": self._member_cache,
+        }
 
     def clean(self):
-        self._user_cache.clear()
-        self._scene_cache.clear()
-        self._member_cache.clear()
-        self.session_cache.clear()
-        for task in self._timertasks:
-            task.cancel()
+        for timers in self._timertasks.values():
+            for handle in timers.values():
+                handle.cancel()
         self._timertasks.clear()
+        for partitions in self._caches.values():
+            partitions.clear()
+        self._activity.clear()
+        self._event_tasks.clear()
+        if self.pool is not None:
+            self.pool.clear()
 
-    def supply(self, func: TSupplier) -> TSupplier:
+    def release(self, self_id: str):
+        """释放某个机器人的全部缓存，并取消其缓存条目的过期计时器"""
+        for handle in self._timertasks.pop(self_id, {}).values():
+            handle.cancel()
+        for partitions in self._caches.values():
+            partitions.pop(self_id, None)
+        self._activity.pop(self_id, None)
+        for key in [key for key, (owner, _, _) in self._event_tasks.items() if owner == self_id]:
+            del self._event_tasks[key]
+
+    def _get_partitions(self, kind: str) -> dict[str, dict[Any, Any]]:
+        try:
+            return self._caches[kind]
+        except KeyError:
+            raise ValueError(f"Unknown cache kind: {kind}") from None
+
+    def _get_cache(self, kind: str, self_id: str, key: Any) -> Any:
+        if (cache := self._get_partitions(kind).get(self_id)) is not None:
+            return cache.get(key)
+        return None
+
+    def _put_cache(self, kind: str, self_id: str, key: Any, value: Any, expire: float | None = None):
+        partitions = self._get_partitions(kind)
+        if (cache := partitions.get(self_id)) is None:
+            cache = partitions[self_id] = {}
+        cache[key] = value
+        if (timers := self._timertasks.get(self_id)) is None:
+            timers = self._timertasks[self_id] = {}
+        if old := timers.pop((kind, key), None):
+            old.cancel()
+        timers[(kind, key)] = asyncio.get_running_loop().call_later(
+            conf.uninfo_cache_expire if expire is None else expire, self._expire_cache, kind, self_id, key
+        )
+
+    def _expire_cache(self, kind: str, self_id: str, key: Any):
+        if (timers := self._timertasks.get(self_id)) is not None:
+            timers.pop((kind, key), None)
+            if not timers:
+                del self._timertasks[self_id]
+        partitions = self._get_partitions(kind)
+        if (cache := partitions.get(self_id)) is not None:
+            cache.pop(key, None)
+            if not cache:
+                del partitions[self_id]
+
+    def iter_cache(self) -> Iterator[tuple[str, str, Any, Any, float]]:
+        """遍历当前缓存的条目，产出 (种类, 机器人 id, 键, 值, 剩余有效时间)"""
+        now = asyncio.get_running_loop().time()
+        for self_id, timers in self._timertasks.items():
+            for (kind, key), handle in timers.items():
+                value = self._get_cache(kind, self_id, key)
+                if value is not None:
+                    yield kind, self_id, key, value, handle.when() - now
+
+    def restore_cache(self, kind: str, self_id: str, key: Any, value: Any, expire: float):
+        """恢复一条缓存条目，`expire` 为剩余有效时间；未启用缓存时不做任何事"""
+        if not conf.uninfo_cache or expire <= 0:
+            return
+        if kind == "session":
+            value = self._finalize(value, self.pool.session if self.pool is not None else None)
+        elif kind == "user":
+            value = self._finalize(value, self.pool.user if self.pool is not None else None)
+        elif kind == "scene":
+            value = self._finalize(value, self.pool.scene if self.pool is not None else None)
+        else:
+            value = self._finalize(value, self.pool.member if self.pool is not None else None)
+        self._put_cache(kind, self_id, key, value, expire)
+
+    @staticmethod
+    def _register(mapping: dict[type[Event], Any], func: Callable) -> None:
         event_type = get_type_hints(func)["event"]
         if get_origin(event_type) in (Union, UnionType):
             for t in get_args(event_type):
-                self.endpoint[t] = func  # type: ignore
+                mapping[t] = func
         else:
-            self.endpoint[event_type] = func  # type: ignore
+            mapping[event_type] = func
+
+    def supply(self, func: TSupplier) -> TSupplier:
+        self._register(self.endpoint, func)
+        return func
+
+    def supply_shallow(self, func: TShallowSupplier) -> TShallowSupplier:
+        """注册仅从事件本身提取场景与用户 id 的供给函数，不允许调用任何 API
+
+        返回的字典需包含 `user_id`, `scene_id`, `scene_type`，
+        若场景存在父级场景，则还需包含 `parent_id` 与 `parent_type`
+        """
+        self._register(self.shallow_endpoint, func)
         return func
 
     def supply_wildcard(self, func: TSupplier) -> TSupplier:
@@ -87,73 +188,231 @@ class InfoFetcher(metaclass=ABCMeta):
             operator=self.extract_member(data["operator"], None) if "operator" in data else None,  # type: ignore
         )
 
-    async def fetch(self, bot: Bot, event: Event) -> Session:
+    def parse_shallow(self, data: dict) -> Session:
+        parent = Scene(id=data["parent_id"], type=data["parent_type"]) if "parent_id" in data else None
+        return Session(
+            self_id=data["self_id"],
+            adapter=data["adapter"],
+            scope=data["scope"],
+            user=User(id=data["user_id"]),
+            scene=Scene(id=data["scene_id"], type=data["scene_type"], parent=parent),
+        )
+
+    async def fetch_shallow(self, bot: Bot, event: Event) -> Session:
+        """获取仅包含场景类型与各类 id 的会话信息
+
+        若已有缓存的完整会话则直接返回；若适配器未提供对应的浅层供给函数，则退回到 `fetch`
+        """
+        if task := self._get_event_task(event):
+            if task.done() and not task.cancelled() and not task.exception():
+                return task.result()
         try:
             sess_id = self.get_session_id(event)
         except ValueError:
             pass
         else:
-            if sess_id in self.session_cache:
-                return self.session_cache[sess_id]
-        func = None
+            if (sess := self._get_cache("session", bot.self_id, sess_id)) is not None:
+                return sess
+        if not (func := self._get_shallow_endpoint(event)):
+            return await self.fetch(bot, event)
+        try:
+            data = func(bot, event)
+        except NotImplementedError:
+            return await self.fetch(bot, event)
+        return self.parse_shallow({**self.supply_self(bot), **data})
+
+    def _get_shallow_endpoint(self, event: Event) -> Callable[[Bot, Event], dict] | None:
         for t in event.__class__.__mro__[:-1]:
-            func = self.endpoint.get(t)
-            if func:
-                break
-        base = self.supply_self(bot)
+            if func := self.shallow_endpoint.get(t):
+                return func
+        return None
+
+    def _assemble_cached(self, bot: Bot, event: Event) -> Session | None:
+        """由缓存的场景、成员与用户信息组装消息事件的会话，不调用任何 API；缓存不完整时返回 None
+
+        预热后各群组/频道的第一条消息因此无需请求平台接口。
+        仅处理消息事件，因为其他事件可能带有浅层供给函数不会提取的操作者信息
+        """
+        if event.get_type() != "message" or not (func := self._get_shallow_endpoint(event)):
+            return None
         try:
-            if func:
-                data = await func(bot, event)
-                sess = self.parse({**base, **data})
-            elif self.wildcard:
-                data = await self.wildcard(bot, event)
-                sess = self.parse({**base, **data})
-            else:
-                raise NotImplementedError(f"Event {type(event)} not supported yet")
+            data = func(bot, event)
         except NotImplementedError:
-            raise NotImplementedError(f"Event {type(event)} not supported yet") from None
+            return None
+        scene_type = int(data["scene_type"])
+        parent_id = data.get("parent_id")
+        scene = self._get_cache("scene", bot.self_id, (scene_type, data["scene_id"], parent_id))
+        if scene is None:
+            return None
+        member = None
+        if scene.is_private:
+            user = self._get_cache("user", bot.self_id, data["user_id"])
+        else:
+            member = self._get_cache("member", bot.self_id, (scene_type, parent_id or scene.id, data["user_id"]))
+            if member is None and scene.parent:
+                # 预热时频道成员以其所属的频道服务器为键缓存
+                parent = scene.parent
+                member = self._get_cache("member", bot.self_id, (parent.type.value, parent.id, data["user_id"]))
+            user = member.user if member else None
+        if user is None:
+            return None
+        return Session(**self.supply_self(bot), scene=scene, user=user, member=member)
+
+    def _finalize(self, model: TModel, intern: Callable[[TModel], TModel] | None) -> TModel:
+        if conf.uninfo_cache_frozen:
+            model = model.freeze()
+            if intern:
+                model = intern(model)
+        return model
+
+    def _get_event_task(self, event: Event) -> asyncio.Task[Session] | None:
+        if entry := self._event_tasks.get(id(event)):
+            _, ref, task = entry
+            if ref() is event:
+                return task
+        return None
+
+    async def fetch(self, bot: Bot, event: Event) -> Session:
+        """获取事件对应的会话信息
+
+        同一事件对象在分发期间至多解析一次，权限、规则与处理函数共享同一结果
+        """
+        if task := self._get_event_task(event):
+            return await asyncio.shield(task)
+        if task := self.prefetch(bot, event):
+            return await asyncio.shield(task)
+        return await self._fetch(bot, event)
+
+    def prefetch(self, bot: Bot, event: Event) -> asyncio.Task[Session] | None:
+        """在后台开始解析事件对应的会话信息，之后的 `fetch` 将直接等待该任务"""
+        if task := self._get_event_task(event):
+            return task
+        key = id(event)
+        try:
+            ref = weakref.ref(event, lambda _: self._event_tasks.pop(key, None))
+        except TypeError:
+            return None
+        task = asyncio.create_task(self._fetch(bot, event))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._event_tasks[key] = (bot.self_id, ref, task)
+        return task
+
+    async def _fetch(self, bot: Bot, event: Event) -> Session:
+        try:
+            sess_id = self.get_session_id(event)
+        except ValueError:
+            pass
+        else:
+            if (sess := self._get_cache("session", bot.self_id, sess_id)) is not None:
+                return sess
+        sess = self._assemble_cached(bot, event) if conf.uninfo_cache else None
+        if sess is None:
+            sess = await self._supply(bot, event)
+        sess = self._finalize(sess, self.pool.session if self.pool is not None else None)
+        if conf.uninfo_warmup_members:
+            if (activity := self._activity.get(bot.self_id)) is None:
+                activity = self._activity[bot.self_id] = Counter()
+            if sess.scene.is_group or sess.scene.is_guild:
+                activity[(sess.scene.type.value, sess.scene.id)] += 1
+            elif sess.scene.is_channel and sess.scene.parent:
+                activity[(sess.scene.parent.type.value, sess.scene.parent.id)] += 1
         if conf.uninfo_cache:
             try:
                 sess_id = self.get_session_id(event)
-                self.session_cache[sess_id] = sess
-                asyncio.get_running_loop().call_later(conf.uninfo_cache_expire, self.session_cache.pop, sess_id, None)
-                key1 = sess.user.id
-                self._user_cache[bot.self_id][key1] = sess.user
-                asyncio.get_running_loop().call_later(
-                    conf.uninfo_cache_expire, self._user_cache[bot.self_id].pop, key1, None
-                )
+                self._put_cache("session", bot.self_id, sess_id, sess)
+                self._put_cache("user", bot.self_id, sess.user.id, sess.user)
                 key2 = (sess.scene.type.value, sess.scene.id, sess.scene.parent.id if sess.scene.parent else None)
-                self._scene_cache[bot.self_id][key2] = sess.scene
-                asyncio.get_running_loop().call_later(
-                    conf.uninfo_cache_expire, self._scene_cache[bot.self_id].pop, key2, None
-                )
+                self._put_cache("scene", bot.self_id, key2, sess.scene)
                 if sess.member:
                     key3 = (
                         sess.scene.type.value,
                         sess.scene.parent.id if sess.scene.parent else sess.scene.id,
                         sess.member.id,
                     )
-                    self._member_cache[bot.self_id][key3] = sess.member
-                    asyncio.get_running_loop().call_later(
-                        conf.uninfo_cache_expire, self._member_cache[bot.self_id].pop, key3, None
-                    )
+                    self._put_cache("member", bot.self_id, key3, sess.member)
             except ValueError:
                 pass
         return sess
 
+    async def _supply(self, bot: Bot, event: Event) -> Session:
+        func = None
+        for t in event.__class__.__mro__[:-1]:
+            func = self.endpoint.get(t)
+            if func:
+                break
+        base = self.supply_self(bot)
+        try:
+            if func:
+                data = await func(bot, event)
+                return self.parse({**base, **data})
+            if self.wildcard:
+                data = await self.wildcard(bot, event)
+                return self.parse({**base, **data})
+            raise NotImplementedError(f"Event {type(event)} not supported yet")
+        except NotImplementedError:
+            raise NotImplementedError(f"Event {type(event)} not supported yet") from None
+
+    async def warmup(self, bot: Bot, members_limit: int = 0, concurrency: int = 1, interval: float = 0.0):
+        """预先拉取场景列表写入缓存，并拉取最活跃的若干群组/频道的成员列表
+
+        之后消息事件的会话将直接由缓存组装，无需调用 API。
+        活跃度仅统计本次运行中该机器人收到的事件，且随 `release` 一并清空；
+        因此启动后首次预热时尚无统计，此时拉取成员列表的场景按平台返回的顺序选取
+
+        Args:
+            bot (Bot): 需要预热的机器人
+            members_limit (int): 拉取成员列表的场景数量上限，为 0 时不拉取成员
+            concurrency (int): 同时拉取成员列表的场景数
+            interval (float): 每个场景的成员列表拉取完成后的等待时间，用于避免触发平台的频率限制
+        """
+        if not conf.uninfo_cache:
+            return
+        scenes: list[Scene] = []
+        try:
+            async for scene in self.query_scenes(bot):
+                scene = self._finalize(scene, self.pool.scene if self.pool is not None else None)
+                key = (scene.type.value, scene.id, scene.parent.id if scene.parent else None)
+                self._put_cache("scene", bot.self_id, key, scene)
+                if scene.is_group or scene.is_guild:
+                    scenes.append(scene)
+        except NotImplementedError:
+            return
+        except AdapterException as e:
+            log("WARNING", f"Failed to warm up scenes of bot {bot.self_id}: {e}")
+            return
+        if members_limit <= 0 or not scenes:
+            return
+        activity = self._activity.get(bot.self_id, Counter())
+        scenes.sort(key=lambda scene: activity[(scene.type.value, scene.id)], reverse=True)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def _load_members(scene: Scene):
+            async with semaphore:
+                try:
+                    async for member in self.query_members(bot, scene.type, scene.id):
+                        member = self._finalize(member, self.pool.member if self.pool is not None else None)
+                        self._put_cache("member", bot.self_id, (scene.type.value, scene.id, member.id), member)
+                except NotImplementedError:
+                    return
+                except AdapterException as e:
+                    log("WARNING", f"Failed to warm up members of {scene.id} for bot {bot.self_id}: {e}")
+                if interval:
+                    await asyncio.sleep(interval)
+
+        await asyncio.gather(*(_load_members(scene) for scene in scenes[:members_limit]))
+
     @abstractmethod
     async def query_user(self, bot: Bot, user_id: str) -> User | None:
         pass
 
     async def fetch_user(self, bot: Bot, user_id: str) -> User | None:
-        if user_id in self._user_cache[bot.self_id]:
-            return self._user_cache[bot.self_id][user_id]
+        if (user := self._get_cache("user", bot.self_id, user_id)) is not None:
+            return user
         user = await self.query_user(bot, user_id)
+        if user:
+            user = self._finalize(user, self.pool.user if self.pool is not None else None)
         if user and conf.uninfo_cache:
-            self._user_cache[bot.self_id][user_id] = user
-            asyncio.get_running_loop().call_later(
-                conf.uninfo_cache_expire, self._user_cache[bot.self_id].pop, user_id, None
-            )
+            self._put_cache("user", bot.self_id, user_id, user)
         return user
 
     @abstractmethod
@@ -162,18 +421,30 @@ class InfoFetcher(metaclass=ABCMeta):
     ) -> Scene | None:
         pass
 
+    def get_cached_scene(
+        self, bot: Bot, scene_type: SceneType, scene_id: str, *, parent_scene_id: str | None = None
+    ) -> Scene | None:
+        """获取已缓存的场景信息，不调用任何 API"""
+        return self._get_cache("scene", bot.self_id, (scene_type.value, scene_id, parent_scene_id))
+
+    def get_cached_channel_type(self, bot: Bot, channel_id: str, guild_id: str) -> SceneType:
+        """消息事件通常不携带子频道类型，优先使用已缓存的子频道信息，否则视为文字子频道"""
+        for scene_type in (SceneType.CHANNEL_TEXT, SceneType.CHANNEL_VOICE, SceneType.CHANNEL_CATEGORY):
+            if self.get_cached_scene(bot, scene_type, channel_id, parent_scene_id=guild_id) is not None:
+                return scene_type
+        return SceneType.CHANNEL_TEXT
+
     async def fetch_scene(
         self, bot: Bot, scene_type: SceneType, scene_id: str, *, parent_scene_id: str | None = None
     ) -> Scene | None:
         key = (scene_type.value, scene_id, parent_scene_id)
-        if key in self._scene_cache[bot.self_id]:
-            return self._scene_cache[bot.self_id][key]
+        if (scene := self._get_cache("scene", bot.self_id, key)) is not None:
+            return scene
         scene = await self.query_scene(bot, scene_type, scene_id, parent_scene_id=parent_scene_id)
+        if scene:
+            scene = self._finalize(scene, self.pool.scene if self.pool is not None else None)
         if scene and conf.uninfo_cache:
-            self._scene_cache[bot.self_id][key] = scene
-            asyncio.get_running_loop().call_later(
-                conf.uninfo_cache_expire, self._scene_cache[bot.self_id].pop, key, None
-            )
+            self._put_cache("scene", bot.self_id, key, scene)
         return scene
 
     @abstractmethod
@@ -182,14 +453,13 @@ class InfoFetcher(metaclass=ABCMeta):
 
     async def fetch_member(self, bot: Bot, scene_type: SceneType, parent_scene_id: str, user_id: str) -> Member | None:
         key = (scene_type.value, parent_scene_id, user_id)
-        if key in self._member_cache[bot.self_id]:
-            return self._member_cache[bot.self_id][key]
+        if (member := self._get_cache("member", bot.self_id, key)) is not None:
+            return member
         member = await self.query_member(bot, scene_type, parent_scene_id, user_id)
+        if member:
+            member = self._finalize(member, self.pool.member if self.pool is not None else None)
         if member and conf.uninfo_cache:
-            self._member_cache[bot.self_id][key] = member
-            asyncio.get_running_loop().call_later(
-                conf.uninfo_cache_expire, self._member_cache[bot.self_id].pop, key, None
-            )
+            self._put_cache("member", bot.self_id, key, member)
         return member
 
     @abstractmethod
@@ -0,0 +1,49 @@
+import asyncio
+
+from nonebot import get_driver
+from nonebot.adapters import Bot
+
+from .adapters import INFO_FETCHER_MAPPING
+from .fetch import conf
+from .warmup import cancel_warmup, start_warmup
+
+_release_handles: dict[tuple[str, str], asyncio.TimerHandle] = {}
+
+
+def release_bot_cache(bot: Bot):
+    """立即释放机器人的全部缓存"""
+    adapter = bot.adapter.get_name()
+    if handle := _release_handles.pop((adapter, bot.self_id), None):
+        handle.cancel()
+    if fetcher := INFO_FETCHER_MAPPING.get(adapter):
+        fetcher.release(bot.self_id)
+
+
+async def _on_bot_connect(bot: Bot):
+    if handle := _release_handles.pop((bot.adapter.get_name(), bot.self_id), None):
+        handle.cancel()
+    if conf.uninfo_warmup:
+        start_warmup(bot)
+
+
+async def _on_bot_disconnect(bot: Bot):
+    cancel_warmup(bot)
+    if conf.uninfo_cache_release_delay <= 0:
+        release_bot_cache(bot)
+        return
+    key = (bot.adapter.get_name(), bot.self_id)
+    if handle := _release_handles.pop(key, None):
+        handle.cancel()
+    _release_handles[key] = asyncio.get_running_loop().call_later(
+        conf.uninfo_cache_release_delay, release_bot_cache, bot
+    )
+
+
+try:
+    _driver = get_driver()
+except ValueError:
+    # 在 nonebot.init() 之前导入时驱动器尚未创建，此时不注册钩子，与配置回退到默认值的行为一致
+    pass
+else:
+    _driver.on_bot_connect(_on_bot_connect)
+    _driver.on_bot_disconnect(_on_bot_disconnect)
@@ -1,6 +1,7 @@
-from dataclasses import asdict, dataclass, field
+from collections.abc import Callable, Sequence
+from dataclasses import FrozenInstanceError, asdict, dataclass, field, fields
 from datetime import datetime, timedelta
-from enum import IntEnum
+from enum import Enum, IntEnum
 import json
 from typing import Any, Optional, TypedDict, TypeVar
 from typing_extensions import Required
@@ -10,6 +11,11 @@ from nonebot.compat import DEFAULT_CONFIG, PYDANTIC_V2
 from .constraint import SupportAdapter, SupportScope
 from .util import DatetimeJsonEncoder
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class BasicInfo(TypedDict):
     self_id: Required[str]
@@ -32,7 +38,10 @@ class SceneType(IntEnum):
     """子频道语音场景"""
 
 
+_SCENE_TYPES = tuple(SceneType)
+
 C = TypeVar("C")
+T = TypeVar("T")
 
 
 def _apply_schema(cls: type[C]) -> type[C]:
@@ -64,19 +73,66 @@ def _apply_schema(cls: type[C]) -> type[C]:
 
 
 class ModelMixin:
+    __slots__ = ("__weakref__",)
 
     @classmethod
     def load(cls, data: dict):
         return cls(**data)  # type: ignore  # noqa
 
+    @classmethod
+    def load_trusted(cls, data: dict):
+        """从本库 `dump()` 的结果快速构造模型，跳过复制与防御性转换
+
+        仅适用于由本库序列化得到的数据，其他来源请使用 `load`
+        """
+        return cls.load(data)
+
+    @property
+    def frozen(self) -> bool:
+        """是否为只读实例"""
+        return type(self) in _MUTABLE
+
+    def freeze(self):
+        """获取只读的副本，嵌套的模型同样会被冻结，已冻结的实例直接返回自身"""
+        cls = type(self)
+        if cls in _MUTABLE:
+            return self
+        frozen_cls = _FROZEN.get(cls) or _make_frozen(cls)
+        obj = object.__new__(frozen_cls)
+        for f in fields(self):  # type: ignore
+            object.__setattr__(obj, f.name, _freeze_value(getattr(self, f.name)))
+        return obj
+
+    def replace(self, **changes):
+        """基于当前实例派生新实例，未修改的字段与原实例共享；只读实例派生的结果仍为只读"""
+        cls = _MUTABLE.get(type(self), type(self))
+        values = {f.name: getattr(self, f.name) for f in fields(self) if f.init}  # type: ignore
+        values.update(changes)
+        obj = cls(**values)
+        return obj.freeze() if cls is not type(self) else obj
+
     def dump(self) -> dict[str, Any]:
-        return json.loads(self.dump_json())
+        return json.loads(json.dumps(asdict(self), ensure_ascii=False, cls=DatetimeJsonEncoder))  # type: ignore  # noqa
 
     def dump_json(self, indent: int | None = None) -> str:
-        return json.dumps(asdict(self), ensure_ascii=False, indent=indent, cls=DatetimeJsonEncoder)  # type: ignore  # noqa
+        data = self.dump()
+        # orjson 无缩进时输出紧凑格式，与 json 的默认分隔符不同，因此仅在两空格缩进时使用
+        if orjson is not None and indent == 2:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(data, ensure_ascii=False, indent=indent)
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    return int(value.timestamp()) if value else None
+
+
+def _enum_value(value):
+    return value.value if isinstance(value, Enum) else value
 
 
 class HashableMixin:
+    __slots__ = ()
+
     id: str
 
     def __hash__(self) -> int:
@@ -86,8 +142,29 @@ class HashableMixin:
         return isinstance(other, type(self)) and self.id == other.id
 
 
+class DerivedCacheMixin:
+    """为派生属性提供缓存
+
+    只读实例的派生值在首次访问时计算并缓存；可变实例随时可能被修改，因此每次访问都重新计算
+    """
+
+    __slots__ = ("_derived",)
+
+    def _derive(self, name: str, func: Callable[[Any], T]) -> T:
+        if type(self) not in _MUTABLE:
+            return func(self)
+        try:
+            cache = self._derived
+        except AttributeError:
+            cache = {}
+            object.__setattr__(self, "_derived", cache)
+        if name not in cache:
+            cache[name] = func(self)
+        return cache[name]
+
+
 @_apply_schema
-@dataclass
+@dataclass(slots=True)
 class Scene(ModelMixin, HashableMixin):
     """对话场景，如群组、频道、私聊等"""
 
@@ -118,6 +195,15 @@ class Scene(ModelMixin, HashableMixin):
     def is_channel(self) -> bool:
         return self.type.value >= SceneType.CHANNEL_TEXT.value
 
+    def dump(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "type": int(self.type),
+            "name": self.name,
+            "avatar": self.avatar,
+            "parent": self.parent.dump() if self.parent else None,
+        }
+
     @classmethod
     def load(cls, data: dict):
         _data = data.copy()
@@ -126,9 +212,20 @@ class Scene(ModelMixin, HashableMixin):
             _data["parent"] = cls.load(data["parent"])
         return cls(**_data)
 
+    @classmethod
+    def load_trusted(cls, data: dict):
+        parent = data["parent"]
+        return cls(
+            data["id"],
+            _SCENE_TYPES[data["type"]],
+            data["name"],
+            data["avatar"],
+            cls.load_trusted(parent) if parent else None,
+        )
+
 
 @_apply_schema
-@dataclass
+@dataclass(slots=True)
 class User(ModelMixin, HashableMixin):
     """用户信息"""
 
@@ -143,9 +240,16 @@ class User(ModelMixin, HashableMixin):
     gender: str = "unknown"
     """用户性别"""
 
+    def dump(self) -> dict[str, Any]:
+        return {"id": self.id, "name": self.name, "nick": self.nick, "avatar": self.avatar, "gender": self.gender}
+
+    @classmethod
+    def load_trusted(cls, data: dict):
+        return cls(data["id"], data["name"], data["nick"], data["avatar"], data["gender"])
+
 
 @_apply_schema
-@dataclass
+@dataclass(slots=True)
 class Role(ModelMixin):
     """群员角色信息"""
 
@@ -156,9 +260,16 @@ class Role(ModelMixin):
     name: str | None = None
     """角色名称"""
 
+    def dump(self) -> dict[str, Any]:
+        return {"id": self.id, "level": self.level, "name": self.name}
+
+    @classmethod
+    def load_trusted(cls, data: dict):
+        return cls(data["id"], data["level"], data["name"])
+
 
 @_apply_schema
-@dataclass
+@dataclass(slots=True)
 class MuteInfo(ModelMixin):
     """禁言信息"""
 
@@ -169,6 +280,13 @@ class MuteInfo(ModelMixin):
     start_at: datetime | None = None
     """禁言开始时间"""
 
+    def dump(self) -> dict[str, Any]:
+        return {
+            "muted": self.muted,
+            "duration": self.duration.total_seconds(),
+            "start_at": _timestamp(self.start_at),
+        }
+
     @classmethod
     def load(cls, data: dict):
         _data = data.copy()
@@ -177,6 +295,20 @@ class MuteInfo(ModelMixin):
             _data["start_at"] = datetime.fromtimestamp(data["start_at"])
         return cls(**_data)
 
+    @classmethod
+    def load_trusted(cls, data: dict, now: datetime | None = None):
+        """跳过 `__post_init__`，禁言是否过期仅在存在开始时间时以 `now` 判断一次"""
+        self = object.__new__(cls)
+        duration = timedelta(seconds=data["duration"])
+        start_at = datetime.fromtimestamp(ts) if (ts := data["start_at"]) else None
+        muted = data["muted"] and duration.total_seconds() >= 1
+        if muted and start_at and ((now or datetime.now()) - start_at) > duration:
+            muted = False
+        self.muted = muted
+        self.duration = duration
+        self.start_at = start_at
+        return self
+
     def __post_init__(self):
         if self.duration.total_seconds() < 1:
             self.muted = False
@@ -185,8 +317,8 @@ class MuteInfo(ModelMixin):
 
 
 @_apply_schema
-@dataclass
-class Member(ModelMixin):
+@dataclass(slots=True)
+class Member(ModelMixin, DerivedCacheMixin):
     """群员信息"""
 
     user: User
@@ -197,8 +329,8 @@ class Member(ModelMixin):
     """群员禁言信息"""
     joined_at: datetime | None = None
     """加入时间"""
-    roles: list[Role] = field(default_factory=list)
-    """群员角色"""
+    roles: Sequence[Role] = field(default_factory=list)
+    """群员角色，只读实例中为元组"""
 
     @property
     def id(self) -> str:
@@ -207,10 +339,22 @@ class Member(ModelMixin):
     @property
     def role(self) -> Role | None:
         """获取权限最高的角色"""
+        return self._derive("role", Member._get_role)
+
+    def _get_role(self) -> Role | None:
         if not self.roles:
             return None
         return max(self.roles, key=lambda r: r.level)
 
+    def dump(self) -> dict[str, Any]:
+        return {
+            "user": self.user.dump(),
+            "nick": self.nick,
+            "mute": self.mute.dump() if self.mute else None,
+            "joined_at": _timestamp(self.joined_at),
+            "roles": [role.dump() for role in self.roles],
+        }
+
     @classmethod
     def load(cls, data: dict):
         _data = data.copy()
@@ -225,10 +369,22 @@ class Member(ModelMixin):
             _data["joined_at"] = datetime.fromtimestamp(data["joined_at"])
         return cls(**_data)
 
+    @classmethod
+    def load_trusted(cls, data: dict, now: datetime | None = None):
+        mute = data["mute"]
+        joined_at = data["joined_at"]
+        return cls(
+            User.load_trusted(data["user"]),
+            data["nick"],
+            MuteInfo.load_trusted(mute, now) if mute else None,
+            datetime.fromtimestamp(joined_at) if joined_at else None,
+            [Role(role["id"], role["level"], role["name"]) for role in data["roles"]],
+        )
+
 
 @_apply_schema
-@dataclass
-class Session(ModelMixin, HashableMixin):
+@dataclass(slots=True)
+class Session(ModelMixin, HashableMixin, DerivedCacheMixin):
     """对话信息"""
 
     self_id: str
@@ -245,28 +401,35 @@ class Session(ModelMixin, HashableMixin):
     """群员信息"""
     operator: Member | None = None
     """操作者信息"""
-    platform: str | set[str] | None = None
+    platform: str | set[str] | frozenset[str] | None = None
     """平台名称，仅当目标适配器存在多个平台时使用"""
 
     @property
     def id(self) -> str:
         """会话唯一标识符"""
-        if self.scene.is_private:
-            return self.scene_path
-        return f"{self.scene_path}_{self.user.id}"
+        return self._derive("id", Session._get_id)
 
     @property
     def scene_path(self) -> str:
         """会话的场景路径，类似于 `event.get_session_id()`"""
-        if self.scene.is_private:
-            if self.scene.parent:
-                return f"{self.scene.parent.id}_{self.user.id}"
+        return self._derive("scene_path", Session._get_scene_path)
+
+    def _get_id(self) -> str:
+        if self.scene.type == SceneType.PRIVATE:
+            return self.scene_path
+        return f"{self.scene_path}_{self.user.id}"
+
+    def _get_scene_path(self) -> str:
+        scene = self.scene
+        if scene.type == SceneType.PRIVATE:
+            if scene.parent:
+                return f"{scene.parent.id}_{self.user.id}"
             return self.user.id
-        if self.scene.is_group:
-            return self.scene.id
-        if self.scene.parent:
-            return f"{self.scene.parent.id}_{self.scene.id}"
-        return self.scene.id
+        if scene.type == SceneType.GROUP:
+            return scene.id
+        if scene.parent:
+            return f"{scene.parent.id}_{scene.id}"
+        return scene.id
 
     @property
     def guild(self) -> Scene | None:
@@ -296,7 +459,24 @@ class Session(ModelMixin, HashableMixin):
 
     @property
     def basic(self) -> BasicInfo:
-        return {"self_id": self.self_id, "adapter": SupportAdapter(self.adapter), "scope": SupportScope(self.scope)}
+        return self._derive("basic", Session._get_basic).copy()  # type: ignore
+
+    def _get_basic(self) -> BasicInfo:
+        adapter = self.adapter if isinstance(self.adapter, SupportAdapter) else SupportAdapter(self.adapter)
+        scope = self.scope if isinstance(self.scope, SupportScope) else SupportScope(self.scope)
+        return {"self_id": self.self_id, "adapter": adapter, "scope": scope}
+
+    def dump(self) -> dict[str, Any]:
+        return {
+            "self_id": self.self_id,
+            "adapter": _enum_value(self.adapter),
+            "scope": _enum_value(self.scope),
+            "scene": self.scene.dump(),
+            "user": self.user.dump(),
+            "member": self.member.dump() if self.member else None,
+            "operator": self.operator.dump() if self.operator else None,
+            "platform": sorted(self.platform) if isinstance(self.platform, (set, frozenset)) else self.platform,
+        }
 
     @classmethod
     def load(cls, data: dict):
@@ -310,3 +490,90 @@ class Session(ModelMixin, HashableMixin):
         if data.get("operator"):
             _data["operator"] = Member.load(data["operator"])
         return cls(**_data)
+
+    @classmethod
+    def load_trusted(cls, data: dict, now: datetime | None = None):
+        member = data["member"]
+        operator = data["operator"]
+        platform = data["platform"]
+        return cls(
+            data["self_id"],
+            SupportAdapter(data["adapter"]),
+            SupportScope(data["scope"]),
+            Scene.load_trusted(data["scene"]),
+            User.load_trusted(data["user"]),
+            Member.load_trusted(member, now) if member else None,
+            Member.load_trusted(operator, now) if operator else None,
+            set(platform) if isinstance(platform, list) else platform,
+        )
+
+
+_FROZEN: dict[type, type] = {}
+_MUTABLE: dict[type, type] = {}
+
+
+def _freeze_value(value):
+    if isinstance(value, ModelMixin):
+        return value.freeze()
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _compare_value(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _frozen_setattr(self, name: str, value):
+    raise FrozenInstanceError(f"cannot assign to field {name!r} of {type(self).__name__}")
+
+
+def _frozen_delattr(self, name: str):
+    raise FrozenInstanceError(f"cannot delete field {name!r} of {type(self).__name__}")
+
+
+def _rebuild_frozen(cls: type, values: dict[str, Any]):
+    obj = object.__new__(cls)
+    for name, value in values.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+def _make_frozen(cls: type[C]) -> type[C]:
+    names = tuple(f.name for f in fields(cls))  # type: ignore
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, cls):
+            return NotImplemented
+        return all(_compare_value(getattr(self, name)) == _compare_value(getattr(other, name)) for name in names)
+
+    def __reduce__(self):
+        return _rebuild_frozen, (type(self), {name: getattr(self, name) for name in names})
+
+    frozen_cls = type(
+        f"Frozen{cls.__name__}",
+        (cls,),
+        {
+            "__slots__": (),
+            "__doc__": cls.__doc__,
+            "__module__": cls.__module__,
+            "__setattr__": _frozen_setattr,
+            "__delattr__": _frozen_delattr,
+            "__eq__": __eq__,
+            "__hash__": cls.__hash__,
+            "__reduce__": __reduce__,
+        },
+    )
+    _FROZEN[cls] = frozen_cls
+    _MUTABLE[frozen_cls] = cls
+    return frozen_cls  # type: ignore
+
+
+FrozenScene = _make_frozen(Scene)
+FrozenUser = _make_frozen(User)
+FrozenRole = _make_frozen(Role)
+FrozenMuteInfo = _make_frozen(MuteInfo)
+FrozenMember = _make_frozen(Member)
+FrozenSession = _make_frozen(Session)
@@ -1,18 +1,51 @@
 import asyncio
-import json
-
-from nonebot import get_bots, require
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Hashable,
+    Iterable,
+    Sequence,
+)
+import contextlib
+import time
+from typing import Any, TypeVar
+
+from nonebot import get_bots, get_driver, require
 from nonebot.adapters import Bot
 from nonebot.params import Depends
 
+from .constraint import log
+from .fetch import conf
 from .model import BasicInfo, Member, Scene, SceneType, Session, User
 from .params import UniSession, get_interface
 
 try:
     require("nonebot_plugin_orm")
     from nonebot_plugin_orm import Model, get_session
-    from sqlalchemy import JSON, Integer, String, UniqueConstraint, exc, select
-    from sqlalchemy.orm import Mapped, mapped_column
+    from sqlalchemy import (
+        JSON,
+        BigInteger,
+        Index,
+        Integer,
+        Select,
+        String,
+        UniqueConstraint,
+        bindparam,
+        delete,
+        exc,
+        func,
+        select,
+        tuple_,
+        update,
+    )
+    from sqlalchemy.dialects import mysql, postgresql, sqlite
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute, Mapped, mapped_column
+    from sqlalchemy.orm.attributes import set_committed_value
 except ImportError:
     raise ImportError("You need to install nonebot_plugin_orm to use this module.")
 
@@ -33,9 +66,13 @@ class BotModel(Model):
     scope: Mapped[str] = mapped_column(String(32))
 
     def get_bot(self) -> Bot | None:
-        for bot in list(get_bots().values()):
-            if bot.self_id == self.self_id and bot.adapter.get_name() == self.adapter:
-                return bot
+        return _get_bot(self.self_id, self.adapter)
+
+
+def _get_bot(self_id: str, adapter: str) -> Bot | None:
+    for bot in list(get_bots().values()):
+        if bot.self_id == self_id and bot.adapter.get_name() == adapter:
+            return bot
 
 
 class SceneModel(Model):
@@ -47,6 +84,7 @@ class SceneModel(Model):
             "scene_type",
             name="nonebot_plugin_uninfo_unique_scene",
         ),
+        Index("nonebot_plugin_uninfo_index_scene_parent", "parent_scene_persist_id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -60,6 +98,10 @@ class SceneModel(Model):
         parent_scene_model = (
             await get_scene_model(self.parent_scene_persist_id) if self.parent_scene_persist_id else None
         )
+        return self.build_scene(parent_scene_model)
+
+    def build_scene(self, parent_scene_model: "SceneModel | None") -> Scene:
+        """由已加载的父级场景记录构建场景，不访问数据库"""
         return Scene.load(
             {
                 **self.scene_data,
@@ -127,6 +169,9 @@ class SessionModel(Model):
             "user_persist_id",
             name="nonebot_plugin_uninfo_unique_session",
         ),
+        Index("nonebot_plugin_uninfo_index_session_scene", "scene_persist_id", "user_persist_id"),
+        Index("nonebot_plugin_uninfo_index_session_user", "user_persist_id"),
+        Index("nonebot_plugin_uninfo_index_session_last_seen", "last_seen"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -134,76 +179,299 @@ class SessionModel(Model):
     scene_persist_id: Mapped[int] = mapped_column(Integer)
     user_persist_id: Mapped[int] = mapped_column(Integer)
     member_data: Mapped[dict | None] = mapped_column(JSON)
+    last_seen: Mapped[int | None] = mapped_column(BigInteger)
 
     async def to_session(self) -> Session:
-        bot_model = await get_bot_model(self.bot_persist_id)
-        scene_model = await get_scene_model(self.scene_persist_id)
-        scene = await scene_model.to_scene()
-        user_model = await get_user_model(self.user_persist_id)
-        user = await user_model.to_user()
-        member = Member.load(self.member_data) if self.member_data else None
-
-        return Session(
-            self_id=bot_model.self_id,
-            adapter=bot_model.adapter,
-            scope=bot_model.scope,
-            scene=scene,
-            user=user,
-            member=member,
-        )
+        return (await to_sessions([self]))[0]
 
     async def query_session(self) -> Session | None:
-        bot_model = await get_bot_model(self.bot_persist_id)
-        if not (bot := bot_model.get_bot()):
-            return None
-        if not (interface := get_interface(bot)):
-            return None
+        return await _query_session((await to_sessions([self]))[0])
 
-        scene_model = await get_scene_model(self.scene_persist_id)
-        scene = await scene_model.to_scene()
-        if not (
-            scene := await interface.get_scene(
-                SceneType(scene.type), scene.id, parent_scene_id=scene.parent.id if scene.parent else None
-            )
-        ):
-            return None
 
-        user_model = await get_user_model(self.user_persist_id)
-        if not (user := await interface.get_user(user_model.user_id)):
-            return None
+_INSERT_LOCK_STRIPES = 64
+_insert_locks: list[asyncio.Lock] | None = None
 
-        member = await interface.get_member(SceneType(scene_model.scene_type), scene_model.scene_id, user_model.user_id)
 
-        return Session(
-            self_id=bot_model.self_id,
-            adapter=bot_model.adapter,
-            scope=bot_model.scope,
-            scene=scene,
-            user=user,
-            member=member,
-        )
+def _get_insert_lock(model: type[Model], key: Hashable) -> asyncio.Lock:
+    """按表与自然键分段的插入锁，仅同一段内的插入会相互等待"""
+    # py3.10以下，Lock必须在event_loop内创建
+    global _insert_locks
 
+    if _insert_locks is None:
+        _insert_locks = [asyncio.Lock() for _ in range(_INSERT_LOCK_STRIPES)]
+    return _insert_locks[hash((model.__tablename__, key)) % _INSERT_LOCK_STRIPES]
 
-_insert_mutex: asyncio.Lock | None = None
 
+class PersistIdCache:
+    """自然键 -> (持久化 id, 最近一次写入的数据) 的 LRU 缓存"""
 
-def _get_insert_mutex():
-    # py3.10以下，Lock必须在event_loop内创建
-    global _insert_mutex
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[int, Any]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable) -> tuple[int, Any] | None:
+        if (entry := self._data.get(key)) is not None:
+            self._data.move_to_end(key)
+        return entry
 
-    if _insert_mutex is None:
-        _insert_mutex = asyncio.Lock()
-    # elif sys.version_info < (3, 10):
-    #     # 还需要判断loop是否与之前创建的一致
-    #     # 单测中不同的test，loop也不一样
-    #     # 但是nonebot里loop始终是一样的
-    #     if getattr(_insert_mutex, "_loop") != asyncio.get_running_loop():
-    #         _insert_mutex = asyncio.Lock()
+    def put(self, key: Hashable, persist_id: int, data: Any):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (persist_id, data)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
 
-    return _insert_mutex
+    def discard(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def discard_ids(self, persist_ids: Collection[int]):
+        """按持久化 id 丢弃条目，用于对应的记录被删除后"""
+        for key in [key for key, (persist_id, _) in self._data.items() if persist_id in persist_ids]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+
+_bot_ids = PersistIdCache(conf.uninfo_orm_cache_size)
+_scene_ids = PersistIdCache(conf.uninfo_orm_cache_size)
+_user_ids = PersistIdCache(conf.uninfo_orm_cache_size)
+_session_ids = PersistIdCache(conf.uninfo_orm_cache_size)
+
+
+def clear_persist_id_cache():
+    """清空持久化 id 缓存，在外部修改或删除了数据库中的记录后调用"""
+    _bot_ids.clear()
+    _scene_ids.clear()
+    _user_ids.clear()
+    _session_ids.clear()
+
+
+async def _update_by_persist_id(model: type[Model], persist_id: int, **values: Any) -> bool:
+    async with get_session() as db_session:
+        result = await db_session.execute(update(model).where(model.id == persist_id).values(**values))
+        await db_session.commit()
+        return result.rowcount > 0  # type: ignore
+
+
+T = TypeVar("T")
+TModel = TypeVar("TModel", bound=Model)
+
+
+class WriteBehindQueue:
+    """按 (表, 持久化 id) 合并数据变更，并在后台按间隔或数量批量写入"""
+
+    def __init__(self):
+        self._pending: dict[type[Model], dict[int, dict[str, Any]]] = {}
+        self._flushing: dict[type[Model], dict[int, dict[str, Any]]] = {}
+        self._size = 0
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._lock: asyncio.Lock | None = None
+
+    def __len__(self):
+        return self._size
+
+    def put(self, model: type[Model], persist_id: int, **values: Any):
+        rows = self._pending.setdefault(model, {})
+        if (pending := rows.get(persist_id)) is None:
+            rows[persist_id] = values
+            self._size += 1
+        else:
+            pending.update(values)
+        self._ready.set()
+        if self._size >= conf.uninfo_orm_flush_size:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def discard(self, model: type[Model], persist_id: int, names: Iterable[str]):
+        """丢弃某行尚未写入的部分列，在这些列被直接写入数据库后调用，避免旧的变更覆盖新数据"""
+        names = tuple(names)
+        if (rows := self._flushing.get(model)) and (flushing := rows.get(persist_id)):
+            # 正在写入的批次若失败会被重新排队，此时同样不应再写回这些列
+            for name in names:
+                flushing.pop(name, None)
+        if not (rows := self._pending.get(model)) or (pending := rows.get(persist_id)) is None:
+            return
+        for name in names:
+            pending.pop(name, None)
+        if not pending:
+            del rows[persist_id]
+            self._size -= 1
+
+    def apply(self, instance: TModel) -> TModel:
+        """将尚未写入的变更应用到读取出的模型实例上"""
+        if (rows := self._pending.get(type(instance))) and (pending := rows.get(instance.id)):
+            for name, value in pending.items():
+                set_committed_value(instance, name, value)
+        return instance
+
+    def _requeue(self, model: type[Model], rows: dict[int, dict[str, Any]]):
+        pending = self._pending.setdefault(model, {})
+        for persist_id, values in rows.items():
+            if not values:
+                continue
+            if (newer := pending.get(persist_id)) is None:
+                pending[persist_id] = values
+                self._size += 1
+            else:
+                # 写入失败期间排队的变更更新，应保留
+                pending[persist_id] = {**values, **newer}
+        if self._size:
+            self._ready.set()
+
+    async def flush(self) -> bool:
+        """写入所有待写入的变更，写入失败的行将重新排队等待下次写入，全部成功时返回 True
+
+        并发调用时依次执行，保证同一时间只有一个批次在写入
+        """
+        if self._lock is None:
+            # py3.10以下，Lock必须在event_loop内创建
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            return await self._flush()
+
+    async def _flush(self) -> bool:
+        pending, self._pending = self._pending, {}
+        self._flushing = pending
+        self._size = 0
+        self._ready.clear()
+        self._full.clear()
+        success = True
+        try:
+            for model, rows in pending.items():
+                try:
+                    # 按更新的列分组后以 executemany 写入，已被删除的记录将被忽略
+                    groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+                    for persist_id, values in rows.items():
+                        groups.setdefault(tuple(sorted(values)), []).append({"_persist_id": persist_id, **values})
+                    async with get_session() as db_session:
+                        statement = update(model.__table__).where(model.__table__.c.id == bindparam("_persist_id"))
+                        for params in groups.values():
+                            await db_session.execute(statement, params)
+                        await db_session.commit()
+                except Exception as e:
+                    log("ERROR", f"Failed to write {len(rows)} rows to {model.__tablename__}, will retry: {e}")
+                    self._requeue(model, rows)
+                    success = False
+        finally:
+            self._flushing = {}
+        return success
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            if self._size < conf.uninfo_orm_flush_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), conf.uninfo_orm_flush_interval)
+            if not await self.flush():
+                # 写入失败时等待一个间隔再重试，避免在数据库不可用时空转
+                await asyncio.sleep(conf.uninfo_orm_flush_interval)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if not await self.flush():
+            log("ERROR", f"Dropped {self._size} pending rows that could not be written on shutdown")
+
+
+_write_behind = WriteBehindQueue()
+
+
+async def flush_pending_writes():
+    """立即写入所有尚在后台队列中的数据变更"""
+    await _write_behind.flush()
+
+
+async def _write_changes(model: type[Model], persist_id: int, **values: Any) -> bool:
+    if conf.uninfo_orm_write_behind:
+        _write_behind.put(model, persist_id, **values)
+        return True
+    _write_behind.discard(model, persist_id, values)
+    return await _update_by_persist_id(model, persist_id, **values)
+
+
+_last_seen: dict[int, int] = {}
+
+
+async def _touch_session(persist_id: int):
+    """记录会话刚刚出现过，每个会话在 `uninfo_orm_last_seen_interval` 内至多写入一次"""
+    now = int(time.time())
+    if (last := _last_seen.get(persist_id)) is not None and now - last < conf.uninfo_orm_last_seen_interval:
+        return
+    if len(_last_seen) >= max(conf.uninfo_orm_cache_size, 1):
+        _last_seen.clear()
+    _last_seen[persist_id] = now
+    await _write_changes(SessionModel, persist_id, last_seen=now)
+
+
+@get_driver().on_shutdown
+async def _():
+    await _write_behind.close()
+
+
+_BULK_UPSERT_DIALECTS = ("sqlite", "postgresql", "mysql", "mariadb")
+
+
+async def _upsert(model: type[Model], values: dict[str, Any], conflict: tuple[str, ...]) -> int | None:
+    """以单条语句插入或更新一行并返回其持久化 id，当前数据库不支持时返回 None"""
+    changes = {name: value for name, value in values.items() if name not in conflict}
+    async with get_session() as db_session:
+        dialect = db_session.get_bind(model).dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert(model) if dialect == "sqlite" else postgresql.insert(model)
+            statement = (
+                insert.values(**values)
+                .on_conflict_do_update(index_elements=list(conflict), set_=changes)
+                .returning(model.id)
+            )
+            persist_id = (await db_session.execute(statement)).scalar_one()
+        elif dialect in ("mysql", "mariadb"):
+            # MySQL 不支持 RETURNING，借助 LAST_INSERT_ID(expr) 让已存在的行也返回其 id
+            statement = (
+                mysql.insert(model)
+                .values(**values)
+                .on_duplicate_key_update(id=func.last_insert_id(model.id), **changes)
+            )
+            persist_id = (await db_session.execute(statement)).lastrowid  # type: ignore
+        else:
+            return None
+        await db_session.commit()
+    # 已排队的旧变更不应再覆盖刚写入的数据
+    _write_behind.discard(model, persist_id, changes)
+    return persist_id
 
 
 async def get_bot_persist_id(basic_info: BasicInfo) -> int:
+    key = (basic_info["self_id"], basic_info["adapter"].value)
+    scope = basic_info["scope"].value
+    if cached := _bot_ids.get(key):
+        persist_id, cached_scope = cached
+        if cached_scope == scope:
+            return persist_id
+        if await _write_changes(BotModel, persist_id, scope=scope):
+            _bot_ids.put(key, persist_id, scope)
+            return persist_id
+        _bot_ids.discard(key)
+
+    persist_id = await _upsert(
+        BotModel,
+        {"self_id": basic_info["self_id"], "adapter": basic_info["adapter"].value, "scope": scope},
+        ("self_id", "adapter"),
+    )
+    if persist_id is not None:
+        _bot_ids.put(key, persist_id, scope)
+        return persist_id
+
     statement = (
         select(BotModel)
         .where(BotModel.self_id == basic_info["self_id"])
@@ -211,32 +479,64 @@ async def get_bot_persist_id(basic_info: BasicInfo) -> int:
     )
     async with get_session() as db_session:
         if bot_model := (await db_session.scalars(statement)).one_or_none():
-            bot_model.scope = basic_info["scope"].value
-            await db_session.commit()
-            await db_session.refresh(bot_model)
-            return bot_model.id
+            persist_id = bot_model.id
+            if bot_model.scope != scope:
+                bot_model.scope = scope
+                await db_session.commit()
+            _write_behind.discard(BotModel, persist_id, ("scope",))
+            _bot_ids.put(key, persist_id, scope)
+            return persist_id
 
     bot_model = BotModel(
         self_id=basic_info["self_id"],
         adapter=basic_info["adapter"].value,
-        scope=basic_info["scope"].value,
+        scope=scope,
     )
-    async with _get_insert_mutex():
+    async with _get_insert_lock(BotModel, key):
         try:
             async with get_session() as db_session:
                 db_session.add(bot_model)
                 await db_session.commit()
                 await db_session.refresh(bot_model)
-                return bot_model.id
+                persist_id = bot_model.id
         except exc.IntegrityError:
             async with get_session() as db_session:
                 return (await db_session.scalars(statement)).one().id
+    _bot_ids.put(key, persist_id, scope)
+    return persist_id
 
 
 async def get_scene_persist_id(basic_info: BasicInfo, scene: Scene) -> int:
     bot_persist_id = await get_bot_persist_id(basic_info)
     parent_scene_persist_id = await get_scene_persist_id(basic_info, scene.parent) if scene.parent else None
-    scene_data = json.loads(scene.dump_json())
+    scene_data = scene.dump()
+
+    key = (bot_persist_id, scene.id, scene.type.value)
+    if cached := _scene_ids.get(key):
+        persist_id, cached_data = cached
+        if cached_data == (parent_scene_persist_id, scene_data):
+            return persist_id
+        if await _write_changes(
+            SceneModel, persist_id, parent_scene_persist_id=parent_scene_persist_id, scene_data=scene_data
+        ):
+            _scene_ids.put(key, persist_id, (parent_scene_persist_id, scene_data))
+            return persist_id
+        _scene_ids.discard(key)
+
+    persist_id = await _upsert(
+        SceneModel,
+        {
+            "bot_persist_id": bot_persist_id,
+            "parent_scene_persist_id": parent_scene_persist_id,
+            "scene_id": scene.id,
+            "scene_type": scene.type.value,
+            "scene_data": scene_data,
+        },
+        ("bot_persist_id", "scene_id", "scene_type"),
+    )
+    if persist_id is not None:
+        _scene_ids.put(key, persist_id, (parent_scene_persist_id, scene_data))
+        return persist_id
 
     statement = (
         select(SceneModel)
@@ -246,11 +546,14 @@ async def get_scene_persist_id(basic_info: BasicInfo, scene: Scene) -> int:
     )
     async with get_session() as db_session:
         if scene_model := (await db_session.scalars(statement)).one_or_none():
-            scene_model.parent_scene_persist_id = parent_scene_persist_id
-            scene_model.scene_data = scene_data
-            await db_session.commit()
-            await db_session.refresh(scene_model)
-            return scene_model.id
+            persist_id = scene_model.id
+            if scene_model.parent_scene_persist_id != parent_scene_persist_id or scene_model.scene_data != scene_data:
+                scene_model.parent_scene_persist_id = parent_scene_persist_id
+                scene_model.scene_data = scene_data
+                await db_session.commit()
+            _write_behind.discard(SceneModel, persist_id, ("parent_scene_persist_id", "scene_data"))
+            _scene_ids.put(key, persist_id, (parent_scene_persist_id, scene_data))
+            return persist_id
 
     scene_model = SceneModel(
         bot_persist_id=bot_persist_id,
@@ -259,52 +562,111 @@ async def get_scene_persist_id(basic_info: BasicInfo, scene: Scene) -> int:
         scene_type=scene.type.value,
         scene_data=scene_data,
     )
-    async with _get_insert_mutex():
+    async with _get_insert_lock(SceneModel, key):
         try:
             async with get_session() as db_session:
                 db_session.add(scene_model)
                 await db_session.commit()
                 await db_session.refresh(scene_model)
-                return scene_model.id
+                persist_id = scene_model.id
         except exc.IntegrityError:
             async with get_session() as db_session:
                 return (await db_session.scalars(statement)).one().id
+    _scene_ids.put(key, persist_id, (parent_scene_persist_id, scene_data))
+    return persist_id
 
 
 async def get_user_persist_id(basic_info: BasicInfo, user: User) -> int:
     bot_persist_id = await get_bot_persist_id(basic_info)
-    user_data = json.loads(user.dump_json())
+    user_data = user.dump()
+
+    key = (bot_persist_id, user.id)
+    if cached := _user_ids.get(key):
+        persist_id, cached_data = cached
+        if cached_data == user_data:
+            return persist_id
+        if await _write_changes(UserModel, persist_id, user_data=user_data):
+            _user_ids.put(key, persist_id, user_data)
+            return persist_id
+        _user_ids.discard(key)
+
+    persist_id = await _upsert(
+        UserModel,
+        {"bot_persist_id": bot_persist_id, "user_id": user.id, "user_data": user_data},
+        ("bot_persist_id", "user_id"),
+    )
+    if persist_id is not None:
+        _user_ids.put(key, persist_id, user_data)
+        return persist_id
 
     statement = select(UserModel).where(UserModel.bot_persist_id == bot_persist_id).where(UserModel.user_id == user.id)
     async with get_session() as db_session:
         if user_model := (await db_session.scalars(statement)).one_or_none():
-            user_model.user_data = user_data
-            await db_session.commit()
-            await db_session.refresh(user_model)
-            return user_model.id
+            persist_id = user_model.id
+            if user_model.user_data != user_data:
+                user_model.user_data = user_data
+                await db_session.commit()
+            _write_behind.discard(UserModel, persist_id, ("user_data",))
+            _user_ids.put(key, persist_id, user_data)
+            return persist_id
 
     user_model = UserModel(
         bot_persist_id=bot_persist_id,
         user_id=user.id,
         user_data=user_data,
     )
-    async with _get_insert_mutex():
+    async with _get_insert_lock(UserModel, key):
         try:
             async with get_session() as db_session:
                 db_session.add(user_model)
                 await db_session.commit()
                 await db_session.refresh(user_model)
-                return user_model.id
+                persist_id = user_model.id
         except exc.IntegrityError:
             async with get_session() as db_session:
                 return (await db_session.scalars(statement)).one().id
+    _user_ids.put(key, persist_id, user_data)
+    return persist_id
 
 
 async def get_session_persist_id(session: Session) -> int:
-    bot_persist_id = await get_bot_persist_id(session.basic)
-    scene_persist_id = await get_scene_persist_id(session.basic, session.scene)
-    user_persist_id = await get_user_persist_id(session.basic, session.user)
-    member_data = json.loads(session.member.dump_json()) if session.member else None
+    persist_id = await _get_session_persist_id(session)
+    await _touch_session(persist_id)
+    return persist_id
+
+
+async def _get_session_persist_id(session: Session) -> int:
+    basic = session.basic
+    bot_persist_id = await get_bot_persist_id(basic)
+    scene_persist_id = await get_scene_persist_id(basic, session.scene)
+    user_persist_id = await get_user_persist_id(basic, session.user)
+    member_data = session.member.dump() if session.member else None
+
+    key = (bot_persist_id, scene_persist_id, user_persist_id)
+    if cached := _session_ids.get(key):
+        persist_id, cached_data = cached
+        if cached_data == member_data:
+            return persist_id
+        if await _write_changes(SessionModel, persist_id, member_data=member_data):
+            _session_ids.put(key, persist_id, member_data)
+            return persist_id
+        _session_ids.discard(key)
+
+    persist_id = await _upsert(
+        SessionModel,
+        {
+            "bot_persist_id": bot_persist_id,
+            "scene_persist_id": scene_persist_id,
+            "user_persist_id": user_persist_id,
+            "member_data": member_data,
+            "last_seen": int(time.time()),
+        },
+        ("bot_persist_id", "scene_persist_id", "user_persist_id"),
+    )
+    if persist_id is not None:
+        _session_ids.put(key, persist_id, member_data)
+        _last_seen[persist_id] = int(time.time())
+        return persist_id
 
     statement = (
         select(SessionModel)
@@ -314,47 +676,541 @@ async def get_session_persist_id(session: Session) -> int:
     )
     async with get_session() as db_session:
         if session_model := (await db_session.scalars(statement)).one_or_none():
-            session_model.member_data = member_data
-            await db_session.commit()
-            await db_session.refresh(session_model)
-            return session_model.id
+            persist_id = session_model.id
+            if session_model.member_data != member_data:
+                session_model.member_data = member_data
+                await db_session.commit()
+            _write_behind.discard(SessionModel, persist_id, ("member_data",))
+            _session_ids.put(key, persist_id, member_data)
+            return persist_id
 
     session_model = SessionModel(
         bot_persist_id=bot_persist_id,
         scene_persist_id=scene_persist_id,
         user_persist_id=user_persist_id,
         member_data=member_data,
+        last_seen=int(time.time()),
     )
-    async with _get_insert_mutex():
+    async with _get_insert_lock(SessionModel, key):
         try:
             async with get_session() as db_session:
                 db_session.add(session_model)
                 await db_session.commit()
                 await db_session.refresh(session_model)
-                return session_model.id
+                persist_id = session_model.id
         except exc.IntegrityError:
             async with get_session() as db_session:
                 return (await db_session.scalars(statement)).one().id
+    _session_ids.put(key, persist_id, member_data)
+    return persist_id
+
+
+async def _get_dialect(model: type[Model]) -> str:
+    async with get_session() as db_session:
+        return db_session.get_bind(model).dialect.name
+
+
+async def _bulk_upsert(
+    db_session: AsyncSession,
+    model: type[Model],
+    rows: list[dict[str, Any]],
+    conflict: tuple[str, ...],
+    *,
+    overwrite: bool = True,
+) -> dict[tuple, int]:
+    """在一条语句中插入或更新多行，返回 自然键 -> 持久化 id，仅支持 SQLite, PostgreSQL 与 MySQL
+
+    `overwrite` 为 False 时已存在的行保持不变，仅插入缺失的行
+    """
+    rows = list({tuple(row[name] for name in conflict): row for row in rows}.values())
+    if not rows:
+        return {}
+    columns = [getattr(model, name) for name in conflict]
+    keys = [tuple(row[name] for name in conflict) for row in rows]
+    dialect = db_session.get_bind(model).dialect.name
+    if dialect in ("mysql", "mariadb"):
+        insert = mysql.insert(model)
+        changes = (
+            {name: insert.inserted[name] for name in rows[0] if name not in conflict}
+            if overwrite
+            else {"id": model.__table__.c.id}
+        )
+        await db_session.execute(insert.values(rows).on_duplicate_key_update(changes))
+        statement = select(model.id, *columns).where(tuple_(*columns).in_(keys))
+    else:
+        insert = sqlite.insert(model) if dialect == "sqlite" else postgresql.insert(model)
+        if overwrite:
+            statement = (
+                insert.values(rows)
+                .on_conflict_do_update(
+                    index_elements=list(conflict),
+                    set_={name: insert.excluded[name] for name in rows[0] if name not in conflict},
+                )
+                .returning(model.id, *columns)
+            )
+        else:
+            # 未插入的行不会出现在 RETURNING 中，因此另行查询全部的 id
+            await db_session.execute(insert.values(rows).on_conflict_do_nothing(index_elements=list(conflict)))
+            statement = select(model.id, *columns).where(tuple_(*columns).in_(keys))
+    return {tuple(row[1:]): row[0] for row in await db_session.execute(statement)}
+
+
+async def _chunked(items: Iterable[T] | AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    chunk: list[T] = []
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _scene_levels(chunk: list[Scene], persisted: dict[tuple[int, str], int]) -> list[list[tuple[Scene, bool]]]:
+    """将一批场景按层级分组，返回由浅至深的 (场景, 是否在列表中) 列表
+
+    不在本批次中且尚未写入的父级场景作为占位加入，它们只应在不存在时写入
+    """
+    nodes: dict[tuple[int, str], tuple[Scene, bool]] = {(scene.type.value, scene.id): (scene, True) for scene in chunk}
+    for scene in chunk:
+        parent = scene.parent
+        while parent and (key := (parent.type.value, parent.id)) not in nodes and key not in persisted:
+            nodes[key] = (parent, False)
+            parent = parent.parent
+    depths: dict[tuple[int, str], int] = {}
+
+    def _depth(key: tuple[int, str]) -> int:
+        if (depth := depths.get(key)) is None:
+            parent = nodes[key][0].parent
+            parent_key = (parent.type.value, parent.id) if parent else None
+            depth = depths[key] = _depth(parent_key) + 1 if parent_key in nodes else 0  # type: ignore
+        return depth
+
+    levels: dict[int, list[tuple[Scene, bool]]] = {}
+    for key, node in nodes.items():
+        levels.setdefault(_depth(key), []).append(node)
+    return [levels[depth] for depth in sorted(levels)]
+
+
+async def sync_scenes(
+    basic_info: BasicInfo, scenes: Iterable[Scene] | AsyncIterable[Scene], chunk_size: int = 500
+) -> dict[tuple[int, str], int]:
+    """批量持久化场景列表，例如 `Interface.iter_scenes()` 的结果
+
+    每 `chunk_size` 个场景在一个事务中按层级写入，父级场景先于子场景写入；
+    未在列表中出现的父级场景仅在不存在时以占位数据写入
+
+    Returns:
+        dict[tuple[int, str], int]: (场景类型, 场景 id) -> 场景的持久化 id
+    """
+    bot_persist_id = await get_bot_persist_id(basic_info)
+    bulk = await _get_dialect(SceneModel) in _BULK_UPSERT_DIALECTS
+    result: dict[tuple[int, str], int] = {}
+    async for chunk in _chunked(scenes, chunk_size):
+        if not bulk:
+            for scene in chunk:
+                result[(scene.type.value, scene.id)] = await get_scene_persist_id(basic_info, scene)
+            continue
+        async with get_session() as db_session:
+            # 按层级依次写入，每一层的父级场景 id 均已在上一层得到
+            for level in _scene_levels(chunk, result):
+                for listed in (True, False):
+                    rows = [
+                        {
+                            "bot_persist_id": bot_persist_id,
+                            "parent_scene_persist_id": (
+                                result[(scene.parent.type.value, scene.parent.id)] if scene.parent else None
+                            ),
+                            "scene_id": scene.id,
+                            "scene_type": scene.type.value,
+                            "scene_data": scene.dump(),
+                        }
+                        for scene, is_listed in level
+                        if is_listed is listed
+                    ]
+                    persisted = await _bulk_upsert(
+                        db_session, SceneModel, rows, ("bot_persist_id", "scene_id", "scene_type"), overwrite=listed
+                    )
+                    for row in rows:
+                        key = (bot_persist_id, row["scene_id"], row["scene_type"])
+                        result[(row["scene_type"], row["scene_id"])] = persisted[key]
+                        if listed:
+                            _scene_ids.put(key, persisted[key], (row["parent_scene_persist_id"], row["scene_data"]))
+            await db_session.commit()
+        for scene in chunk:
+            _write_behind.discard(
+                SceneModel, result[(scene.type.value, scene.id)], ("parent_scene_persist_id", "scene_data")
+            )
+    return result
+
+
+async def sync_members(
+    basic_info: BasicInfo, scene: Scene, members: Iterable[Member] | AsyncIterable[Member], chunk_size: int = 500
+) -> dict[str, int]:
+    """批量持久化场景的成员列表，例如 `Interface.iter_members()` 的结果
+
+    每 `chunk_size` 个成员的用户与会话记录在一个事务中写入
+
+    Returns:
+        dict[str, int]: 用户 id -> 该成员在此场景下会话的持久化 id
+    """
+    bot_persist_id = await get_bot_persist_id(basic_info)
+    scene_persist_id = await get_scene_persist_id(basic_info, scene)
+    bulk = await _get_dialect(SessionModel) in _BULK_UPSERT_DIALECTS
+    result: dict[str, int] = {}
+    async for chunk in _chunked(members, chunk_size):
+        if not bulk:
+            for member in chunk:
+                session = Session(
+                    self_id=basic_info["self_id"],
+                    adapter=basic_info["adapter"],
+                    scope=basic_info["scope"],
+                    scene=scene,
+                    user=member.user,
+                    member=member,
+                )
+                result[member.id] = await get_session_persist_id(session)
+            continue
+        now = int(time.time())
+        user_rows = [
+            {"bot_persist_id": bot_persist_id, "user_id": member.id, "user_data": member.user.dump()}
+            for member in chunk
+        ]
+        async with get_session() as db_session:
+            users = await _bulk_upsert(db_session, UserModel, user_rows, ("bot_persist_id", "user_id"))
+            session_rows = [
+                {
+                    "bot_persist_id": bot_persist_id,
+                    "scene_persist_id": scene_persist_id,
+                    "user_persist_id": users[(bot_persist_id, member.id)],
+                    "member_data": member.dump(),
+                    "last_seen": now,
+                }
+                for member in chunk
+            ]
+            sessions = await _bulk_upsert(
+                db_session, SessionModel, session_rows, ("bot_persist_id", "scene_persist_id", "user_persist_id")
+            )
+            await db_session.commit()
+        for user_row, session_row in zip(user_rows, session_rows):
+            key = (bot_persist_id, scene_persist_id, session_row["user_persist_id"])
+            _user_ids.put((bot_persist_id, user_row["user_id"]), session_row["user_persist_id"], user_row["user_data"])
+            _session_ids.put(key, sessions[key], session_row["member_data"])
+            _last_seen[sessions[key]] = now
+            _write_behind.discard(UserModel, session_row["user_persist_id"], ("user_data",))
+            _write_behind.discard(SessionModel, sessions[key], ("member_data", "last_seen"))
+            result[user_row["user_id"]] = sessions[key]
+    return result
 
 
 async def get_bot_model(persist_id: int) -> BotModel:
     async with get_session() as db_session:
-        return (await db_session.scalars(select(BotModel).where(BotModel.id == persist_id))).one()
+        model = (await db_session.scalars(select(BotModel).where(BotModel.id == persist_id))).one()
+        return _write_behind.apply(model)
 
 
 async def get_scene_model(persist_id: int) -> SceneModel:
     async with get_session() as db_session:
-        return (await db_session.scalars(select(SceneModel).where(SceneModel.id == persist_id))).one()
+        model = (await db_session.scalars(select(SceneModel).where(SceneModel.id == persist_id))).one()
+        return _write_behind.apply(model)
 
 
 async def get_user_model(persist_id: int) -> UserModel:
     async with get_session() as db_session:
-        return (await db_session.scalars(select(UserModel).where(UserModel.id == persist_id))).one()
+        model = (await db_session.scalars(select(UserModel).where(UserModel.id == persist_id))).one()
+        return _write_behind.apply(model)
 
 
 async def get_session_model(persist_id: int) -> SessionModel:
     async with get_session() as db_session:
-        return (await db_session.scalars(select(SessionModel).where(SessionModel.id == persist_id))).one()
+        model = (await db_session.scalars(select(SessionModel).where(SessionModel.id == persist_id))).one()
+        return _write_behind.apply(model)
+
+
+_IN_CHUNK_SIZE = 500
+
+
+async def _load_by_persist_ids(
+    db_session: AsyncSession, model: type[TModel], persist_ids: Iterable[int]
+) -> dict[int, TModel]:
+    ids = list(set(persist_ids))
+    result: dict[int, TModel] = {}
+    for i in range(0, len(ids), _IN_CHUNK_SIZE):
+        statement = select(model).where(model.id.in_(ids[i : i + _IN_CHUNK_SIZE]))
+        for instance in await db_session.scalars(statement):
+            result[instance.id] = _write_behind.apply(instance)
+    return result
+
+
+async def to_sessions(models: Sequence[SessionModel]) -> list[Session]:
+    """批量将会话记录转换为会话
+
+    关联的机器人、场景 (含父级场景) 与用户记录通过分批的 `IN` 查询一次性加载
+    """
+    if not models:
+        return []
+    async with get_session() as db_session:
+        bots = await _load_by_persist_ids(db_session, BotModel, (model.bot_persist_id for model in models))
+        scenes = await _load_by_persist_ids(db_session, SceneModel, (model.scene_persist_id for model in models))
+        parent_ids = {
+            scene.parent_scene_persist_id
+            for scene in scenes.values()
+            if scene.parent_scene_persist_id and scene.parent_scene_persist_id not in scenes
+        }
+        if parent_ids:
+            scenes.update(await _load_by_persist_ids(db_session, SceneModel, parent_ids))
+        users = await _load_by_persist_ids(db_session, UserModel, (model.user_persist_id for model in models))
+
+    sessions = []
+    for model in models:
+        bot_model = bots[model.bot_persist_id]
+        scene_model = scenes[model.scene_persist_id]
+        parent_id = scene_model.parent_scene_persist_id
+        user_model = users[model.user_persist_id]
+        sessions.append(
+            Session(
+                self_id=bot_model.self_id,
+                adapter=bot_model.adapter,
+                scope=bot_model.scope,
+                scene=scene_model.build_scene(scenes[parent_id] if parent_id else None),
+                user=User(**{**user_model.user_data, "id": user_model.user_id}),
+                member=Member.load(model.member_data) if model.member_data else None,
+            )
+        )
+    return sessions
+
+
+async def _iter_keyset(statement: Select, column: InstrumentedAttribute, batch_size: int) -> AsyncIterator[list[Any]]:
+    last = None
+    while True:
+        page_statement = statement.order_by(column).limit(batch_size)
+        if last is not None:
+            page_statement = page_statement.where(column > last)
+        async with get_session() as db_session:
+            page = [_write_behind.apply(instance) for instance in await db_session.scalars(page_statement)]
+        if not page:
+            return
+        yield page
+        if len(page) < batch_size:
+            return
+        last = getattr(page[-1], column.key)
+
+
+async def iter_scene_models(
+    bot_persist_id: int,
+    scene_type: SceneType | None = None,
+    *,
+    parent_scene_persist_id: int | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[SceneModel]:
+    """按持久化 id 分页遍历机器人的场景记录
+
+    Args:
+        bot_persist_id (int): 机器人的持久化 id
+        scene_type (SceneType, optional): 仅遍历该类型的场景
+        parent_scene_persist_id (int, optional): 仅遍历该场景的子场景
+        batch_size (int): 每页读取的记录数
+    """
+    statement = select(SceneModel).where(SceneModel.bot_persist_id == bot_persist_id)
+    if scene_type is not None:
+        statement = statement.where(SceneModel.scene_type == scene_type.value)
+    if parent_scene_persist_id is not None:
+        statement = statement.where(SceneModel.parent_scene_persist_id == parent_scene_persist_id)
+    async for page in _iter_keyset(statement, SceneModel.id, batch_size):
+        for model in page:
+            yield model
+
+
+async def iter_user_models(bot_persist_id: int, *, batch_size: int = 500) -> AsyncIterator[UserModel]:
+    """按持久化 id 分页遍历机器人已知的用户记录"""
+    statement = select(UserModel).where(UserModel.bot_persist_id == bot_persist_id)
+    async for page in _iter_keyset(statement, UserModel.id, batch_size):
+        for model in page:
+            yield model
+
+
+def _session_statement(
+    bot_persist_id: int | None, scene_persist_id: int | None, user_persist_id: int | None
+) -> tuple[Select, InstrumentedAttribute]:
+    statement = select(SessionModel)
+    if bot_persist_id is not None:
+        statement = statement.where(SessionModel.bot_persist_id == bot_persist_id)
+    if user_persist_id is not None:
+        statement = statement.where(SessionModel.user_persist_id == user_persist_id)
+    if scene_persist_id is not None:
+        statement = statement.where(SessionModel.scene_persist_id == scene_persist_id)
+        if user_persist_id is None:
+            # 同一场景内用户唯一，沿 (scene_persist_id, user_persist_id) 索引分页
+            return statement, SessionModel.user_persist_id
+    return statement, SessionModel.id
+
+
+async def iter_session_models(
+    *,
+    bot_persist_id: int | None = None,
+    scene_persist_id: int | None = None,
+    user_persist_id: int | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[SessionModel]:
+    """分页遍历会话记录，例如某个场景内的全部成员，或某个用户的全部会话
+
+    Args:
+        bot_persist_id (int, optional): 仅遍历该机器人的会话
+        scene_persist_id (int, optional): 仅遍历该场景内的会话
+        user_persist_id (int, optional): 仅遍历该用户的会话
+        batch_size (int): 每页读取的记录数
+    """
+    statement, column = _session_statement(bot_persist_id, scene_persist_id, user_persist_id)
+    async for page in _iter_keyset(statement, column, batch_size):
+        for model in page:
+            yield model
+
+
+async def iter_sessions(
+    *,
+    bot_persist_id: int | None = None,
+    scene_persist_id: int | None = None,
+    user_persist_id: int | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[Session]:
+    """与 `iter_session_models` 相同，但产出由 `to_sessions` 逐页重建的会话"""
+    statement, column = _session_statement(bot_persist_id, scene_persist_id, user_persist_id)
+    async for page in _iter_keyset(statement, column, batch_size):
+        for session in await to_sessions(page):
+            yield session
+
+
+async def _query_session(stored: Session) -> Session | None:
+    if not (bot := _get_bot(stored.self_id, stored.adapter)):
+        return None
+    if not (interface := get_interface(bot)):
+        return None
+
+    scene_type = SceneType(stored.scene.type)
+    scene, user, member = await asyncio.gather(
+        interface.get_scene(
+            scene_type, stored.scene.id, parent_scene_id=stored.scene.parent.id if stored.scene.parent else None
+        ),
+        interface.get_user(stored.user.id),
+        interface.get_member(scene_type, stored.scene.id, stored.user.id),
+    )
+    if not scene or not user:
+        return None
+
+    return Session(
+        self_id=stored.self_id,
+        adapter=stored.adapter,
+        scope=stored.scope,
+        scene=scene,
+        user=user,
+        member=member,
+    )
+
+
+async def query_sessions(models: Sequence[SessionModel], concurrency: int = 16) -> list[Session | None]:
+    """批量从平台重新获取会话记录对应的最新会话信息
+
+    记录通过 `to_sessions` 批量读取，至多 `concurrency` 个会话同时请求平台 API；
+    无法获取或请求失败的会话对应 None
+
+    Args:
+        models (Sequence[SessionModel]): 会话记录
+        concurrency (int): 同时请求的会话数
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _query(stored: Session) -> Session | None:
+        async with semaphore:
+            try:
+                return await _query_session(stored)
+            except Exception as e:
+                log("WARNING", f"Failed to query session {stored.id} of bot {stored.self_id}: {e}")
+                return None
+
+    results: list[Session | None] = []
+    for i in range(0, len(models), _IN_CHUNK_SIZE):
+        stored = await to_sessions(models[i : i + _IN_CHUNK_SIZE])
+        results.extend(await asyncio.gather(*(_query(session) for session in stored)))
+    return results
+
+
+async def collect_stale_sessions(
+    max_age: float,
+    *,
+    batch_size: int = 1000,
+    pause: float = 0.1,
+    archive: Callable[[Sequence[SessionModel]], Awaitable[Any]] | None = None,
+) -> int:
+    """分批删除超过 `max_age` 秒未出现的会话记录，返回删除的数量
+
+    每批在单独的短事务中删除，批次之间等待 `pause` 秒以免长时间占用数据库；
+    未记录最近出现时间的会话不会被删除
+
+    Args:
+        max_age (float): 会话未出现的最长时间，单位为秒
+        batch_size (int): 每批删除的记录数
+        pause (float): 批次之间的等待时间
+        archive (Callable, optional): 在删除每批记录前于事务之外调用，可用于归档
+    """
+    await _write_behind.flush()
+    cutoff = int(time.time() - max_age)
+    statement = (
+        select(SessionModel).where(SessionModel.last_seen < cutoff).order_by(SessionModel.last_seen).limit(batch_size)
+    )
+    deleted = 0
+    while True:
+        async with get_session() as db_session:
+            models = list(await db_session.scalars(statement))
+        if not models:
+            break
+        # 归档在事务之外进行，避免耗时的归档长时间持有数据库锁
+        if archive:
+            await archive(models)
+        persist_ids = {model.id for model in models}
+        async with get_session() as db_session:
+            # 选出后再次出现过的会话不应被删除
+            result = await db_session.execute(
+                delete(SessionModel).where(SessionModel.id.in_(persist_ids)).where(SessionModel.last_seen < cutoff)
+            )
+            await db_session.commit()
+        deleted += result.rowcount  # type: ignore
+        _session_ids.discard_ids(persist_ids)
+        for persist_id in persist_ids:
+            _last_seen.pop(persist_id, None)
+        if len(models) < batch_size:
+            break
+        await asyncio.sleep(pause)
+    return deleted
+
+
+if conf.uninfo_orm_gc_days is not None:
+    _gc_task: asyncio.Task | None = None
+
+    async def _collect_periodically(max_age: float):
+        while True:
+            try:
+                if deleted := await collect_stale_sessions(max_age):
+                    log("INFO", f"Removed {deleted} stale session records")
+            except Exception as e:
+                log("ERROR", f"Failed to remove stale session records: {e}")
+            await asyncio.sleep(conf.uninfo_orm_gc_interval)
+
+    @get_driver().on_startup
+    async def _():
+        global _gc_task
+        _gc_task = asyncio.create_task(_collect_periodically(conf.uninfo_orm_gc_days * 86400))  # type: ignore
+
+    @get_driver().on_shutdown
+    async def _():
+        if _gc_task:
+            _gc_task.cancel()
 
 
 async def get_bot_orm(session: Session = UniSession()):
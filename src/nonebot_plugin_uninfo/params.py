@@ -1,19 +1,22 @@
 from typing import Annotated
 
 from nonebot.adapters import Bot
+from nonebot.exception import AdapterException
 from nonebot.params import Depends
 
 from .adapters import INFO_FETCHER_MAPPING, alter_get_fetcher
 from .fetch import InfoFetcher
-from .model import Member, Scene, SceneType, Session, User
+from .model import BasicInfo, Member, Scene, SceneType, Session, User
+from .table import MemberTable
 
 
-async def get_session(bot: Bot, event):
+def _get_fetcher(bot: Bot) -> InfoFetcher | None:
     adapter = bot.adapter.get_name()
-    fetcher = INFO_FETCHER_MAPPING.get(adapter)
-    if not fetcher:
-        fetcher = alter_get_fetcher(adapter)
-    if fetcher:
+    return INFO_FETCHER_MAPPING.get(adapter) or alter_get_fetcher(adapter)
+
+
+async def get_session(bot: Bot, event):
+    if fetcher := _get_fetcher(bot):
         try:
             return await fetcher.fetch(bot, event)
         except NotImplementedError:
@@ -28,6 +31,128 @@ def UniSession() -> Session:
 Uninfo = Annotated[Session, UniSession()]
 
 
+async def get_shallow_session(bot: Bot, event):
+    """获取不调用任何 API 的会话信息，仅保证场景类型、场景 id 与用户 id 可用"""
+    if fetcher := _get_fetcher(bot):
+        try:
+            return await fetcher.fetch_shallow(bot, event)
+        except NotImplementedError:
+            pass
+    return None
+
+
+def UniSessionShallow() -> Session:
+    return Depends(get_shallow_session)
+
+
+class LazySession:
+    """延迟解析的会话信息
+
+    场景类型、场景 id 与用户 id 等廉价字段可直接同步访问；
+    群员、场景名称与操作者等需要调用 API 的信息在首次 await 时才通过 fetcher 获取
+    """
+
+    def __init__(self, bot: Bot, event, fetcher: InfoFetcher, skeleton: Session):
+        self.bot = bot
+        self.event = event
+        self.fetcher = fetcher
+        self.skeleton = skeleton
+        self._resolved: Session | None = None
+
+    @property
+    def self_id(self) -> str:
+        return self.skeleton.self_id
+
+    @property
+    def adapter(self):
+        return self.skeleton.adapter
+
+    @property
+    def scope(self):
+        return self.skeleton.scope
+
+    @property
+    def basic(self) -> BasicInfo:
+        return self.skeleton.basic
+
+    @property
+    def id(self) -> str:
+        return self.skeleton.id
+
+    @property
+    def scene_path(self) -> str:
+        return self.skeleton.scene_path
+
+    @property
+    def user(self) -> User:
+        """用户信息，未解析前仅保证 id 可用"""
+        return self._resolved.user if self._resolved else self.skeleton.user
+
+    @property
+    def scene(self) -> Scene:
+        """场景信息，未解析前仅保证 id 与类型可用"""
+        return self._resolved.scene if self._resolved else self.skeleton.scene
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved is not None
+
+    async def resolve(self) -> Session:
+        """获取完整的会话信息"""
+        if self._resolved is None:
+            self._resolved = await self.fetcher.fetch(self.bot, self.event)
+        return self._resolved
+
+    async def get_scene(self) -> Scene:
+        """获取包含名称等信息的场景"""
+        if self._resolved:
+            return self._resolved.scene
+        scene = self.skeleton.scene
+        try:
+            fetched = await self.fetcher.fetch_scene(
+                self.bot, scene.type, scene.id, parent_scene_id=scene.parent.id if scene.parent else None
+            )
+        except (NotImplementedError, AdapterException):
+            fetched = None
+        if fetched:
+            return fetched
+        return (await self.resolve()).scene
+
+    async def get_member(self) -> Member | None:
+        """获取群员信息"""
+        if self._resolved:
+            return self._resolved.member
+        scene = self.skeleton.scene
+        if scene.is_private:
+            return None
+        if scene.is_group or scene.is_guild:
+            try:
+                member = await self.fetcher.fetch_member(self.bot, scene.type, scene.id, self.skeleton.user.id)
+            except (NotImplementedError, AdapterException):
+                member = None
+            if member:
+                return member
+        return (await self.resolve()).member
+
+    async def get_operator(self) -> Member | None:
+        """获取操作者信息"""
+        return (await self.resolve()).operator
+
+
+async def get_lazy_session(bot: Bot, event):
+    if fetcher := _get_fetcher(bot):
+        try:
+            skeleton = await fetcher.fetch_shallow(bot, event)
+        except NotImplementedError:
+            return None
+        return LazySession(bot, event, fetcher, skeleton)
+    return None
+
+
+def UniSessionLazy() -> LazySession:
+    return Depends(get_lazy_session)
+
+
 class Interface:
     def __init__(self, bot: Bot, fetcher: InfoFetcher):
         self.bot = bot
@@ -135,11 +260,20 @@ class Interface:
             ans.append(member)
         return ans
 
+    async def get_members_table(self, scene_type: SceneType, scene_id: str) -> MemberTable:
+        """以列存储的形式获取所有成员信息
+
+        Args:
+            scene_type (SceneType): 成员所属的场景类型 (如群组、频道等)
+            scene_id (str): 成员所属的场景id (如群号、频道id等)
+        """
+        return await MemberTable.collect(self.iter_members(scene_type, scene_id))
+
     async def iter_users(self):
         """查询所有用户信息的迭代方法"""
         try:
             async for user in self.fetcher.query_users(self.bot):
-                yield user
+                yield self.fetcher.pool.user(user.freeze()) if self.fetcher.pool is not None else user
         except NotImplementedError:
             return
 
@@ -152,7 +286,7 @@ class Interface:
         """
         try:
             async for scene in self.fetcher.query_scenes(self.bot, scene_type, parent_scene_id=parent_scene_id):
-                yield scene
+                yield self.fetcher.pool.scene(scene.freeze()) if self.fetcher.pool is not None else scene
         except NotImplementedError:
             return
 
@@ -165,7 +299,7 @@ class Interface:
         """
         try:
             async for member in self.fetcher.query_members(self.bot, scene_type, scene_id):
-                yield member
+                yield self.fetcher.pool.member(member.freeze()) if self.fetcher.pool is not None else member
         except NotImplementedError:
             return
 
@@ -1,11 +1,13 @@
+from abc import ABCMeta, abstractmethod
 from collections.abc import Callable
 
 from nonebot.permission import Permission
 
-from .params import Session, UniSession
+from .model import SceneType
+from .params import LazySession, Session, UniSession, UniSessionLazy, UniSessionShallow
 
 
-async def _private(sess: Session | None = UniSession()) -> bool:
+async def _private(sess: Session | None = UniSessionShallow()) -> bool:
     if not sess:
         return False
     return sess.scene.is_private
@@ -15,7 +17,7 @@ PRIVATE: Permission = Permission(_private)
 """ 匹配任意私聊类型事件"""
 
 
-async def _group(sess: Session | None = UniSession()) -> bool:
+async def _group(sess: Session | None = UniSessionShallow()) -> bool:
     if not sess:
         return False
     return sess.scene.is_group
@@ -25,7 +27,7 @@ GROUP: Permission = Permission(_group)
 """匹配任意群聊类型事件"""
 
 
-async def _guild(sess: Session | None = UniSession()) -> bool:
+async def _guild(sess: Session | None = UniSessionShallow()) -> bool:
     if not sess:
         return False
     return sess.scene.is_guild or sess.scene.is_channel
@@ -88,7 +90,7 @@ def ROLE_LEVEL(checker: Callable[[int], bool]) -> Permission:
 def USER_IN(user_id: str, *user_ids: str) -> Permission:
     """检查用户是否在指定用户中"""
 
-    async def _user_in(sess: Session | None = UniSession()) -> bool:
+    async def _user_in(sess: Session | None = UniSessionShallow()) -> bool:
         if not sess:
             return False
         return sess.user.id in (user_id, *user_ids)
@@ -99,7 +101,7 @@ def USER_IN(user_id: str, *user_ids: str) -> Permission:
 def USER_NOT_IN(user_id: str, *user_ids: str) -> Permission:
     """检查用户是否不在指定用户中"""
 
-    async def _user_not_in(sess: Session | None = UniSession()) -> bool:
+    async def _user_not_in(sess: Session | None = UniSessionShallow()) -> bool:
         if not sess:
             return True
         return sess.user.id not in (user_id, *user_ids)
@@ -110,7 +112,7 @@ def USER_NOT_IN(user_id: str, *user_ids: str) -> Permission:
 def SCENE_IN(scene_id: str, *scene_ids: str) -> Permission:
     """检查场景是否在指定场景中"""
 
-    async def _scene_in(sess: Session | None = UniSession()) -> bool:
+    async def _scene_in(sess: Session | None = UniSessionShallow()) -> bool:
         if not sess:
             return False
         return sess.scene.id in (scene_id, *scene_ids)
@@ -121,7 +123,7 @@ def SCENE_IN(scene_id: str, *scene_ids: str) -> Permission:
 def SCENE_NOT_IN(scene_id: str, *scene_ids: str) -> Permission:
     """检查场景是否不在指定场景中"""
 
-    async def _scene_not_in(sess: Session | None = UniSession()) -> bool:
+    async def _scene_not_in(sess: Session | None = UniSessionShallow()) -> bool:
         if not sess:
             return True
         return sess.scene.id not in (scene_id, *scene_ids)
@@ -129,7 +131,184 @@ def SCENE_NOT_IN(scene_id: str, *scene_ids: str) -> Permission:
     return Permission(_scene_not_in)
 
 
+class PermExpr(metaclass=ABCMeta):
+    """可组合的权限表达式，使用 `&`、`|`、`~` 组合后通过 `compile()` 生成单个 `Permission`"""
+
+    cost: int = 0
+    """求值代价，0 表示仅需事件自带的 id 信息，1 表示需要群员信息"""
+
+    def __and__(self, other: "PermExpr") -> "PermExpr":
+        return _All((self, other))
+
+    def __or__(self, other: "PermExpr") -> "PermExpr":
+        return _Any((self, other))
+
+    def __invert__(self) -> "PermExpr":
+        return _Not(self)
+
+    @abstractmethod
+    async def evaluate(self, sess: LazySession) -> bool: ...
+
+    def optimize(self) -> "PermExpr":
+        return self
+
+    def compile(self) -> Permission:
+        """编译为单个 `Permission`，整个表达式至多解析一次会话信息
+
+        当无法获取会话信息时，表达式视为不满足
+        """
+        expr = self.optimize()
+
+        async def _checker(sess: LazySession | None = UniSessionLazy()) -> bool:
+            if not sess:
+                return False
+            return await expr.evaluate(sess)
+
+        return Permission(_checker)
+
+
+class _Not(PermExpr):
+    def __init__(self, expr: PermExpr):
+        self.expr = expr
+        self.cost = expr.cost
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        return not await self.expr.evaluate(sess)
+
+    def optimize(self) -> PermExpr:
+        expr = self.expr.optimize()
+        if isinstance(expr, _Not):
+            return expr.expr
+        return _Not(expr)
+
+
+class _Compound(PermExpr):
+    def __init__(self, exprs: tuple[PermExpr, ...]):
+        self.exprs = exprs
+        self.cost = max((expr.cost for expr in exprs), default=0)
+
+    def optimize(self) -> PermExpr:
+        flat: list[PermExpr] = []
+        for expr in self.exprs:
+            expr = expr.optimize()
+            if type(expr) is type(self):
+                flat.extend(expr.exprs)  # type: ignore
+            else:
+                flat.append(expr)
+        if len(flat) == 1:
+            return flat[0]
+        return type(self)(tuple(sorted(flat, key=lambda expr: expr.cost)))
+
+
+class _All(_Compound):
+    async def evaluate(self, sess: LazySession) -> bool:
+        for expr in self.exprs:
+            if not await expr.evaluate(sess):
+                return False
+        return True
+
+
+class _Any(_Compound):
+    async def evaluate(self, sess: LazySession) -> bool:
+        for expr in self.exprs:
+            if await expr.evaluate(sess):
+                return True
+        return False
+
+
+class _SceneTypeIn(PermExpr):
+    def __init__(self, types: frozenset[SceneType]):
+        self.types = types
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        return sess.scene.type in self.types
+
+
+class _UserIn(PermExpr):
+    def __init__(self, user_ids: frozenset[str]):
+        self.user_ids = user_ids
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        return sess.user.id in self.user_ids
+
+
+class _SceneIn(PermExpr):
+    def __init__(self, scene_ids: frozenset[str]):
+        self.scene_ids = scene_ids
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        return sess.scene.id in self.scene_ids
+
+
+class _RoleIn(PermExpr):
+    cost = 1
+
+    def __init__(self, role_ids: frozenset[str]):
+        self.role_ids = role_ids
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        member = await sess.get_member()
+        if not member or not member.roles:
+            return False
+        return any(role.id in self.role_ids for role in member.roles)
+
+
+class _RoleLevel(PermExpr):
+    cost = 1
+
+    def __init__(self, checker: Callable[[int], bool]):
+        self.checker = checker
+
+    async def evaluate(self, sess: LazySession) -> bool:
+        member = await sess.get_member()
+        if not member or not member.roles:
+            return False
+        return self.checker(max(role.level for role in member.roles))
+
+
+class Perm:
+    """权限表达式构造器
+
+    Example:
+        >>> permission = ((Perm.group() & Perm.role_in("ADMINISTRATOR", "OWNER")) | Perm.user_in("12345")).compile()
+    """
+
+    @staticmethod
+    def private() -> PermExpr:
+        return _SceneTypeIn(frozenset({SceneType.PRIVATE}))
+
+    @staticmethod
+    def group() -> PermExpr:
+        return _SceneTypeIn(frozenset({SceneType.GROUP}))
+
+    @staticmethod
+    def guild() -> PermExpr:
+        return _SceneTypeIn(frozenset(SceneType) - {SceneType.PRIVATE, SceneType.GROUP})
+
+    @staticmethod
+    def scene_type(scene_type: SceneType, *scene_types: SceneType) -> PermExpr:
+        return _SceneTypeIn(frozenset({scene_type, *scene_types}))
+
+    @staticmethod
+    def user_in(user_id: str, *user_ids: str) -> PermExpr:
+        return _UserIn(frozenset({user_id, *user_ids}))
+
+    @staticmethod
+    def scene_in(scene_id: str, *scene_ids: str) -> PermExpr:
+        return _SceneIn(frozenset({scene_id, *scene_ids}))
+
+    @staticmethod
+    def role_in(role_id: str, *role_ids: str) -> PermExpr:
+        return _RoleIn(frozenset({role_id, *role_ids}))
+
+    @staticmethod
+    def role_level(checker: Callable[[int], bool]) -> PermExpr:
+        return _RoleLevel(checker)
+
+
 __all__ = [
+    "Perm",
+    "PermExpr",
     "PRIVATE",
     "GUILD",
     "GROUP",
@@ -0,0 +1,79 @@
+import sys
+from weakref import WeakValueDictionary
+
+from .model import Member, Role, Scene, Session, User
+
+
+def _scene_key(scene: Scene) -> tuple:
+    return (
+        scene.id,
+        int(scene.type),
+        scene.name,
+        scene.avatar,
+        _scene_key(scene.parent) if scene.parent else None,
+    )
+
+
+class InternPool:
+    """按结构去重 `User`、`Role`、`Scene` 的对象池
+
+    池中只保存弱引用，当没有任何缓存或会话持有某个对象时，该对象会被自动回收。
+    由于返回的是共享实例，只应传入只读实例，可变实例被共享后一处修改会影响所有持有者；
+    去重时会直接替换只读实例的内部引用
+    """
+
+    def __init__(self):
+        self._users: WeakValueDictionary[tuple, User] = WeakValueDictionary()
+        self._roles: WeakValueDictionary[tuple, Role] = WeakValueDictionary()
+        self._scenes: WeakValueDictionary[tuple, Scene] = WeakValueDictionary()
+
+    def __len__(self) -> int:
+        return len(self._users) + len(self._roles) + len(self._scenes)
+
+    def clear(self):
+        self._users.clear()
+        self._roles.clear()
+        self._scenes.clear()
+
+    def user(self, user: User) -> User:
+        key = (user.id, user.name, user.nick, user.avatar, user.gender)
+        if (cached := self._users.get(key)) is not None:
+            return cached
+        if type(user.id) is str:
+            object.__setattr__(user, "id", sys.intern(user.id))
+        self._users[key] = user
+        return user
+
+    def role(self, role: Role) -> Role:
+        key = (role.id, role.level, role.name)
+        if (cached := self._roles.get(key)) is not None:
+            return cached
+        if type(role.id) is str:
+            object.__setattr__(role, "id", sys.intern(role.id))
+        self._roles[key] = role
+        return role
+
+    def scene(self, scene: Scene) -> Scene:
+        key = _scene_key(scene)
+        if (cached := self._scenes.get(key)) is not None:
+            return cached
+        if scene.parent:
+            object.__setattr__(scene, "parent", self.scene(scene.parent))
+        if type(scene.id) is str:
+            object.__setattr__(scene, "id", sys.intern(scene.id))
+        self._scenes[key] = scene
+        return scene
+
+    def member(self, member: Member) -> Member:
+        object.__setattr__(member, "user", self.user(member.user))
+        object.__setattr__(member, "roles", type(member.roles)(self.role(role) for role in member.roles))
+        return member
+
+    def session(self, session: Session) -> Session:
+        object.__setattr__(session, "user", self.user(session.user))
+        object.__setattr__(session, "scene", self.scene(session.scene))
+        if session.member:
+            self.member(session.member)
+        if session.operator:
+            self.member(session.operator)
+        return session
@@ -0,0 +1,20 @@
+from nonebot.adapters import Bot, Event
+from nonebot.message import event_preprocessor
+
+from .fetch import conf
+from .params import _get_fetcher
+
+
+async def prefetch_session(bot: Bot, event: Event):
+    """在事件预处理阶段提前开始获取会话信息，使 API 调用与响应器的匹配过程重叠"""
+    adapter = bot.adapter.get_name()
+    if conf.uninfo_prefetch_adapters and adapter not in conf.uninfo_prefetch_adapters:
+        return
+    if event.get_type() not in conf.uninfo_prefetch_event_types:
+        return
+    if fetcher := _get_fetcher(bot):
+        fetcher.prefetch(bot, event)
+
+
+if conf.uninfo_prefetch:
+    event_preprocessor(prefetch_session)
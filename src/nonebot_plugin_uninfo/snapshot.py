@@ -0,0 +1,138 @@
+from datetime import datetime
+import json
+from pathlib import Path
+import struct
+import time
+from typing import BinaryIO
+
+from nonebot import get_driver
+
+from .adapters import INFO_FETCHER_MAPPING
+from .constraint import log
+from .fetch import InfoFetcher, conf
+from .model import Member, Scene, Session, User
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAGIC = b"UNINFO\x00\x01"
+_HEADER = struct.Struct("<d")
+_RECORD = struct.Struct("<BdI")
+KINDS = ("session", "user", "scene", "member")
+_LOADERS = {"session": Session, "user": User, "scene": Scene, "member": Member}
+
+
+def _encode(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _decode(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_snapshot(fetcher: InfoFetcher, fp: BinaryIO) -> int:
+    """将 fetcher 的缓存以长度前缀记录的形式逐条写入 `fp`，返回写入的条目数
+
+    每条记录由 (种类, 剩余有效时间, 负载长度) 的定长头与 `[self_id, key, value]` 的 JSON 负载组成
+    """
+    fp.write(MAGIC)
+    fp.write(_HEADER.pack(time.time()))
+    count = 0
+    for kind, self_id, key, value, expire in fetcher.iter_cache():
+        payload = _encode([self_id, key, value.dump()])
+        fp.write(_RECORD.pack(KINDS.index(kind), expire, len(payload)))
+        fp.write(payload)
+        count += 1
+    return count
+
+
+def load_snapshot(fetcher: InfoFetcher, fp: BinaryIO) -> int:
+    """从 `fp` 中逐条读取快照并恢复到 fetcher 的缓存，已过期的条目将被跳过，返回恢复的条目数
+
+    若快照在写入过程中被截断，则恢复到第一条不完整的记录为止；负载损坏的记录将被跳过
+    """
+    if fp.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Invalid uninfo cache snapshot")
+    (dumped_at,) = _HEADER.unpack(fp.read(_HEADER.size))
+    elapsed = time.time() - dumped_at
+    now = datetime.now()
+    count = 0
+    while header := fp.read(_RECORD.size):
+        if len(header) < _RECORD.size:
+            log("WARNING", "Truncated uninfo cache snapshot, ignoring the incomplete record")
+            break
+        kind_index, expire, length = _RECORD.unpack(header)
+        if kind_index >= len(KINDS):
+            # 记录头已损坏，之后的记录边界不再可信
+            log("WARNING", "Corrupt uninfo cache snapshot, ignoring the remaining records")
+            break
+        payload = fp.read(length)
+        if len(payload) < length:
+            log("WARNING", "Truncated uninfo cache snapshot, ignoring the incomplete record")
+            break
+        expire -= elapsed
+        if expire <= 0:
+            continue
+        kind = KINDS[kind_index]
+        try:
+            self_id, key, data = _decode(payload)
+            if isinstance(key, list):
+                key = tuple(key)
+            if kind in ("session", "member"):
+                value = _LOADERS[kind].load_trusted(data, now)
+            else:
+                value = _LOADERS[kind].load_trusted(data)
+        except (ValueError, TypeError, KeyError) as e:
+            log("WARNING", f"Skipping corrupt uninfo cache snapshot record: {e!r}")
+            continue
+        fetcher.restore_cache(kind, self_id, key, value, expire)
+        count += 1
+    return count
+
+
+def _snapshot_path(directory: Path, fetcher: InfoFetcher) -> Path:
+    return directory / f"{fetcher.adapter.name}.snapshot"
+
+
+async def restore_snapshots(directory: Path):
+    for fetcher in INFO_FETCHER_MAPPING.values():
+        path = _snapshot_path(directory, fetcher)
+        if not path.exists():
+            continue
+        try:
+            with path.open("rb") as fp:
+                count = load_snapshot(fetcher, fp)
+        except Exception as e:
+            log("WARNING", f"Failed to restore cache snapshot {path}: {e}")
+        else:
+            log("DEBUG", f"Restored {count} cache entries for {fetcher.adapter.value}")
+
+
+async def save_snapshots(directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    for fetcher in INFO_FETCHER_MAPPING.values():
+        path = _snapshot_path(directory, fetcher)
+        temp = path.with_suffix(".tmp")
+        with temp.open("wb") as fp:
+            count = dump_snapshot(fetcher, fp)
+        temp.replace(path)
+        log("DEBUG", f"Saved {count} cache entries for {fetcher.adapter.value}")
+
+
+if conf.uninfo_cache_snapshot_dir:
+    _driver = get_driver()
+    _snapshot_dir = conf.uninfo_cache_snapshot_dir
+
+    @_driver.on_startup
+    async def _():
+        await restore_snapshots(_snapshot_dir)
+
+    @_driver.on_shutdown
+    async def _():
+        await save_snapshots(_snapshot_dir)
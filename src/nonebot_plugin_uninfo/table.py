@@ -0,0 +1,124 @@
+from array import array
+from collections.abc import AsyncIterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+import math
+from typing import Any, NamedTuple
+
+from .model import Member, User
+
+
+class MemberRow(NamedTuple):
+    """`MemberTable` 中的一行"""
+
+    id: str
+    """成员的用户 id"""
+    nick: str | None
+    """成员昵称"""
+    joined_at: datetime | None
+    """加入时间"""
+    role_level: int
+    """成员最高角色等级，无角色时为 0"""
+    muted: bool
+    """是否被禁言"""
+
+    def to_member(self) -> Member:
+        """转换为 `Member`
+
+        表中仅保存最高角色等级与禁言标记，因此转换结果不包含角色与禁言信息
+        """
+        return Member(User(self.id), nick=self.nick, joined_at=self.joined_at)
+
+
+@dataclass
+class MemberTable:
+    """以列存储的成员列表，适用于大规模成员数据的统计分析"""
+
+    ids: list[str] = field(default_factory=list)
+    """成员的用户 id"""
+    nicks: list[str | None] = field(default_factory=list)
+    """成员昵称"""
+    joined_at: array = field(default_factory=lambda: array("d"))
+    """加入时间的时间戳，未知时为 NaN"""
+    role_level: array = field(default_factory=lambda: array("q"))
+    """成员最高角色等级，无角色时为 0"""
+    muted: array = field(default_factory=lambda: array("b"))
+    """是否被禁言"""
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> MemberRow:
+        joined_at = self.joined_at[index]
+        return MemberRow(
+            self.ids[index],
+            self.nicks[index],
+            None if math.isnan(joined_at) else datetime.fromtimestamp(joined_at),
+            self.role_level[index],
+            bool(self.muted[index]),
+        )
+
+    def __iter__(self) -> Iterator[MemberRow]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_members(self) -> list[Member]:
+        """转换回 `Member` 列表，见 `MemberRow.to_member`"""
+        return [row.to_member() for row in self]
+
+    def append(self, member: Member):
+        self.ids.append(member.user.id)
+        self.nicks.append(member.nick)
+        self.joined_at.append(member.joined_at.timestamp() if member.joined_at else math.nan)
+        self.role_level.append(max((role.level for role in member.roles), default=0))
+        self.muted.append(1 if member.mute and member.mute.muted else 0)
+
+    @classmethod
+    async def collect(cls, members: AsyncIterable[Member]) -> "MemberTable":
+        """从成员的异步迭代器中逐个构建，不保留 `Member` 对象"""
+        table = cls()
+        async for member in members:
+            table.append(member)
+        return table
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.ids,
+            "nick": self.nicks,
+            "joined_at": self.joined_at,
+            "role_level": self.role_level,
+            "muted": self.muted,
+        }
+
+    def to_numpy(self):
+        """转换为 NumPy 结构化数组"""
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("Please install numpy to use this function")
+        result = np.empty(
+            len(self),
+            dtype=[("id", object), ("nick", object), ("joined_at", "f8"), ("role_level", "i8"), ("muted", "?")],
+        )
+        result["id"] = self.ids
+        result["nick"] = self.nicks
+        result["joined_at"] = np.frombuffer(self.joined_at, dtype="f8")
+        result["role_level"] = np.frombuffer(self.role_level, dtype="i8")
+        result["muted"] = np.frombuffer(self.muted, dtype="i1").astype(bool)
+        return result
+
+    def to_dataframe(self):
+        """转换为 pandas DataFrame"""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("Please install pandas to use this function")
+        return pd.DataFrame(
+            {
+                "id": self.ids,
+                "nick": self.nicks,
+                "joined_at": pd.to_datetime(list(self.joined_at), unit="s"),
+                "role_level": list(self.role_level),
+                "muted": [bool(flag) for flag in self.muted],
+            }
+        )
@@ -0,0 +1,36 @@
+import asyncio
+
+from nonebot.adapters import Bot
+
+from .adapters import INFO_FETCHER_MAPPING
+from .fetch import InfoFetcher, conf
+
+_warmup_tasks: dict[tuple[str, str], asyncio.Task] = {}
+
+
+async def _warmup(fetcher: InfoFetcher, bot: Bot):
+    await asyncio.sleep(conf.uninfo_warmup_interval)
+    await fetcher.warmup(
+        bot,
+        members_limit=conf.uninfo_warmup_members,
+        concurrency=conf.uninfo_warmup_concurrency,
+        interval=conf.uninfo_warmup_interval,
+    )
+
+
+def start_warmup(bot: Bot) -> asyncio.Task | None:
+    """在后台为机器人预热缓存，同一机器人已有的预热任务将被取消"""
+    adapter = bot.adapter.get_name()
+    if not (fetcher := INFO_FETCHER_MAPPING.get(adapter)):
+        return None
+    key = (adapter, bot.self_id)
+    cancel_warmup(bot)
+    task = asyncio.create_task(_warmup(fetcher, bot))
+    _warmup_tasks[key] = task
+    task.add_done_callback(lambda t: _warmup_tasks.pop(key, None) if _warmup_tasks.get(key) is t else None)
+    return task
+
+
+def cancel_warmup(bot: Bot):
+    if task := _warmup_tasks.pop((bot.adapter.get_name(), bot.self_id), None):
+        task.cancel()
@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+import tempfile
+
+from nonebug import NONEBOT_INIT_KWARGS
+import pytest
+
+os.environ["PLUGIN_UNINFO_TESTENV"] = "1"
+
+
+def pytest_configure(config: pytest.Config):
+    database = Path(tempfile.mkdtemp()) / "uninfo.db"
+    config.stash[NONEBOT_INIT_KWARGS] = {
+        "driver": "~none",
+        "log_level": "WARNING",
+        "sqlalchemy_database_url": f"sqlite+aiosqlite:///{database}",
+        "alembic_startup_check": False,
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def after_nonebot_init(after_nonebot_init: None):
+    import nonebot
+    from nonebot.adapters.onebot.v11 import Adapter
+
+    nonebot.get_driver().register_adapter(Adapter)
+    nonebot.require("nonebot_plugin_orm")
+    nonebot.require("nonebot_plugin_uninfo")
+    import nonebot_plugin_uninfo.orm  # noqa: F401
+
+
+@pytest.fixture
+def bot():
+    import nonebot
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    return Bot(Adapter(nonebot.get_driver()), "123")
+
+
+@pytest.fixture
+def basic():
+    from nonebot_plugin_uninfo import SupportAdapter, SupportScope
+
+    return {"self_id": "123", "adapter": SupportAdapter.onebot11, "scope": SupportScope.qq_client}
+
+
+@pytest.fixture
+def fetcher():
+    from nonebot_plugin_uninfo.adapters import INFO_FETCHER_MAPPING
+
+    fetcher = INFO_FETCHER_MAPPING["OneBot V11"]
+    fetcher.clean()
+    yield fetcher
+    fetcher.clean()
+
+
+def make_group_event(group_id: int = 99, user_id: int = 10):
+    from nonebot.adapters.onebot.v11 import GroupMessageEvent, Message
+
+    return GroupMessageEvent(
+        time=0,
+        self_id=123,
+        post_type="message",
+        sub_type="normal",
+        user_id=user_id,
+        message_type="group",
+        message_id=1,
+        message=Message("hello"),
+        original_message=Message("hello"),
+        raw_message="hello",
+        font=0,
+        sender={"user_id": user_id, "nickname": "user", "role": "member"},  # type: ignore
+        to_me=False,
+        group_id=group_id,
+    )
+
+
+def make_private_event(user_id: int = 10):
+    from nonebot.adapters.onebot.v11 import Message, PrivateMessageEvent
+
+    return PrivateMessageEvent(
+        time=0,
+        self_id=123,
+        post_type="message",
+        sub_type="friend",
+        user_id=user_id,
+        message_type="private",
+        message_id=1,
+        message=Message("hello"),
+        original_message=Message("hello"),
+        raw_message="hello",
+        font=0,
+        sender={"user_id": user_id, "nickname": "user"},  # type: ignore
+        to_me=True,
+    )
@@ -0,0 +1,90 @@
+from .conftest import make_group_event, make_private_event
+
+
+async def test_no_api_call_after_warmup(app, fetcher):
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(base=Bot, adapter=ctx.create_adapter(base=Adapter), self_id="123")
+        ctx.should_call_api("get_friend_list", {}, [])
+        ctx.should_call_api("get_group_list", {}, [{"group_id": 99, "group_name": "group"}])
+        ctx.should_call_api(
+            "get_group_member_list",
+            {"group_id": 99},
+            [{"user_id": 10, "nickname": "user", "card": "card", "role": "admin", "join_time": 0, "sex": "male"}],
+        )
+        await fetcher.warmup(bot, members_limit=1)
+
+        # 预热之后不应再调用 get_group_info 与 get_group_member_info
+        sess = await fetcher.fetch(bot, make_group_event())
+        assert sess.scene.name == "group"
+        assert sess.member
+        assert sess.member.nick == "card"
+        assert sess.member.role
+        assert sess.member.role.name == "admin"
+        assert sess.user.name == "user"
+
+
+async def test_fetch_calls_api_without_warmup(app, fetcher):
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(base=Bot, adapter=ctx.create_adapter(base=Adapter), self_id="123")
+        ctx.should_call_api("get_group_info", {"group_id": 99}, {"group_id": 99, "group_name": "group"})
+        ctx.should_call_api(
+            "get_group_member_info",
+            {"group_id": 99, "user_id": 10, "no_cache": True},
+            {"user_id": 10, "nickname": "user", "card": "card", "role": "member", "join_time": 0, "sex": "male"},
+        )
+        sess = await fetcher.fetch(bot, make_group_event())
+        assert sess.scene.name == "group"
+
+
+async def test_fetch_shallow_without_api(app, fetcher):
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    from nonebot_plugin_uninfo import SceneType
+
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(base=Bot, adapter=ctx.create_adapter(base=Adapter), self_id="123")
+        sess = await fetcher.fetch_shallow(bot, make_group_event())
+        assert sess.scene.id == "99"
+        assert sess.scene.type == SceneType.GROUP
+        assert sess.user.id == "10"
+        assert sess.member is None
+
+        sess = await fetcher.fetch_shallow(bot, make_private_event())
+        assert sess.scene.id == "10"
+        assert sess.scene.type == SceneType.PRIVATE
+        assert sess.user.id == "10"
+
+
+async def test_event_fetched_once_without_cache(app, fetcher, monkeypatch):
+    import asyncio
+    import gc
+
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    from nonebot_plugin_uninfo.fetch import conf
+
+    monkeypatch.setattr(conf, "uninfo_cache", False)
+    async with app.test_api() as ctx:
+        bot = ctx.create_bot(base=Bot, adapter=ctx.create_adapter(base=Adapter), self_id="123")
+        # 仅声明一轮 API 调用，多余的调用会使测试失败
+        ctx.should_call_api("get_group_info", {"group_id": 99}, {"group_id": 99, "group_name": "group"})
+        ctx.should_call_api(
+            "get_group_member_info",
+            {"group_id": 99, "user_id": 10, "no_cache": True},
+            {"user_id": 10, "nickname": "user", "card": "card", "role": "member", "join_time": 0, "sex": "male"},
+        )
+        event = make_group_event()
+        sessions = await asyncio.gather(*(fetcher.fetch(bot, event) for _ in range(5)))
+        sessions.append(await fetcher.fetch(bot, event))
+        sessions.append(await fetcher.fetch(bot, event))
+        assert all(sess is sessions[0] for sess in sessions)
+        assert not fetcher.session_cache
+        assert len(fetcher._event_tasks) == 1
+
+        del event
+        gc.collect()
+        assert not fetcher._event_tasks
@@ -0,0 +1,60 @@
+import asyncio
+
+from .conftest import make_group_event
+
+
+async def test_release_drops_bot_cache(app, fetcher, monkeypatch):
+    from nonebot.adapters.onebot.v11 import Adapter, Bot
+
+    from nonebot_plugin_uninfo import release_bot_cache
+    from nonebot_plugin_uninfo.fetch import conf
+    from nonebot_plugin_uninfo.lifecycle import _release_handles
+
+    monkeypatch.setattr(conf, "uninfo_warmup_members", 10)
+    bots, events = [], []
+    async with app.test_api() as ctx:
+        adapter = ctx.create_adapter(base=Adapter)
+        # nonebug 的虚拟适配器名为 fake，需还原为真实名称才能找到对应的 fetcher
+        monkeypatch.setattr(adapter, "get_name", Adapter.get_name)
+        for i in range(5):
+            bot = ctx.create_bot(base=Bot, adapter=adapter, self_id=str(456 + i))
+            ctx.should_call_api("get_group_info", {"group_id": 99}, {"group_id": 99, "group_name": "group"})
+            ctx.should_call_api(
+                "get_group_member_info",
+                {"group_id": 99, "user_id": 10, "no_cache": True},
+                {"user_id": 10, "nickname": "user", "card": "card", "role": "member", "join_time": 0, "sex": "male"},
+            )
+            event = make_group_event()
+            await fetcher.fetch(bot, event)
+            bots.append(bot)
+            events.append(event)
+        await asyncio.sleep(0.01)
+        for bot in bots:
+            assert bot.self_id in fetcher._timertasks
+            assert bot.self_id in fetcher._activity
+            assert bot.self_id in fetcher._scene_cache
+            assert bot.self_id in fetcher._member_cache
+    await asyncio.sleep(0.01)
+    keys = {("OneBot V11", bot.self_id) for bot in bots}
+    assert keys <= _release_handles.keys()
+    assert len(fetcher._event_tasks) == len(bots)
+
+    for bot in bots:
+        release_bot_cache(bot)
+    assert not fetcher._timertasks
+    for kind, partitions in fetcher._caches.items():
+        assert not partitions, kind
+    assert not fetcher._activity
+    assert not fetcher._event_tasks
+    assert keys.isdisjoint(_release_handles)
+
+
+def test_import_before_init():
+    from pathlib import Path
+    import subprocess
+    import sys
+
+    src = Path(__file__).parents[1] / "src"
+    code = f"import sys; sys.path.insert(0, {str(src)!r}); import nonebot_plugin_uninfo.lifecycle"
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
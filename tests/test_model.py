@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+import tracemalloc
+
+
+@dataclass
+class _PlainUser:
+    id: str
+    name: str | None = None
+    nick: str | None = None
+    avatar: str | None = None
+    gender: str = "unknown"
+
+
+def _allocated(factory, count: int = 10000) -> int:
+    tracemalloc.start()
+    objs = [factory(str(i)) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size
+
+
+def test_models_are_slotted():
+    from nonebot_plugin_uninfo import Member, Role, Scene, SceneType, Session, SupportAdapter, SupportScope, User
+
+    user = User("1")
+    for obj in (
+        user,
+        Role("r"),
+        Scene("1", SceneType.GROUP),
+        Member(user),
+        Session("1", SupportAdapter.onebot11, SupportScope.qq_client, Scene("1", SceneType.GROUP), user),
+    ):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_slotted_models_use_less_memory():
+    from nonebot_plugin_uninfo import User
+
+    slotted = _allocated(lambda i: User(i, name="name"))
+    plain = _allocated(lambda i: _PlainUser(i, name="name"))
+    assert slotted < plain
+
+
+def _session():
+    from datetime import datetime
+
+    from nonebot_plugin_uninfo import Member, Role, Scene, SceneType, Session, SupportAdapter, SupportScope, User
+
+    user = User("1", name="名字")
+    return Session(
+        "1",
+        SupportAdapter.onebot11,
+        SupportScope.qq_client,
+        Scene("2", SceneType.CHANNEL_TEXT, parent=Scene("3", SceneType.GUILD)),
+        user,
+        member=Member(user, joined_at=datetime(2024, 1, 1), roles=[Role("admin", 10)]),
+    )
+
+
+def test_dump_json_does_not_depend_on_orjson(monkeypatch):
+    import pytest
+
+    from nonebot_plugin_uninfo import model
+
+    if model.orjson is None:
+        pytest.skip("orjson is not installed")
+    sess = _session()
+    with_orjson = [sess.dump_json(), sess.dump_json(indent=2)]
+    monkeypatch.setattr(model, "orjson", None)
+    assert [sess.dump_json(), sess.dump_json(indent=2)] == with_orjson
+
+
+def test_dump_json_keeps_default_separators():
+    import json
+
+    sess = _session()
+    assert sess.dump_json() == json.dumps(sess.dump(), ensure_ascii=False)
+    assert ", " in sess.dump_json()
+
+
+def test_frozen_session_serializes_without_warnings():
+    import warnings
+
+    from nonebot.compat import type_validate_python
+    from pydantic import BaseModel
+
+    from nonebot_plugin_uninfo import Session
+
+    class Holder(BaseModel):
+        session: Session
+
+    sess = _session()
+    sess.platform = {"qq"}
+    frozen = sess.freeze()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        data = Holder(session=frozen).model_dump(mode="json")
+    assert data == Holder(session=sess).model_dump(mode="json")
+    assert frozen.dump() == sess.dump()
+    assert type_validate_python(Holder, data).session == sess
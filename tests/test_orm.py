@@ -0,0 +1,329 @@
+import pytest
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    from nonebot_plugin_uninfo import orm
+
+    monkeypatch.setattr(orm.conf, "uninfo_orm_write_behind", True)
+    orm.clear_persist_id_cache()
+    yield orm._write_behind
+    orm.clear_persist_id_cache()
+
+
+@pytest.fixture
+async def statements():
+    """记录期间执行的全部 SQL 语句"""
+    from nonebot_plugin_orm import get_session
+    from sqlalchemy import event
+
+    from nonebot_plugin_uninfo import orm
+
+    async with get_session() as db_session:
+        engine = db_session.get_bind(orm.SessionModel)
+    executed: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+async def test_sync_upsert_supersedes_queued_update(basic, write_behind):
+    from nonebot_plugin_uninfo import User
+    from nonebot_plugin_uninfo.orm import (
+        clear_persist_id_cache,
+        flush_pending_writes,
+        get_user_model,
+        get_user_persist_id,
+    )
+
+    persist_id = await get_user_persist_id(basic, User("20", name="v1"))
+    assert await get_user_persist_id(basic, User("20", name="v2")) == persist_id
+    assert len(write_behind) == 1
+
+    # 缓存被淘汰后，下一次写入会直接 upsert 到数据库
+    clear_persist_id_cache()
+    assert await get_user_persist_id(basic, User("20", name="v3")) == persist_id
+    assert len(write_behind) == 0
+    await flush_pending_writes()
+    assert (await get_user_model(persist_id)).user_data["name"] == "v3"
+
+
+async def test_failed_flush_requeues_rows(monkeypatch, basic, write_behind):
+    from nonebot_plugin_uninfo import User, orm
+
+    persist_id = await orm.get_user_persist_id(basic, User("21", name="v1"))
+    await orm.get_user_persist_id(basic, User("21", name="v2"))
+
+    def broken():
+        raise RuntimeError("database is down")
+
+    with monkeypatch.context() as m:
+        m.setattr(orm, "get_session", broken)
+        assert not await write_behind.flush()
+    assert len(write_behind) == 1
+
+    await orm.get_user_persist_id(basic, User("21", name="v3"))
+    assert await write_behind.flush()
+    assert (await orm.get_user_model(persist_id)).user_data["name"] == "v3"
+
+
+async def test_concurrent_flushes_are_serialized(monkeypatch, basic, write_behind):
+    import asyncio
+    import contextlib
+
+    from nonebot_plugin_uninfo import User, orm
+
+    first = await orm.get_user_persist_id(basic, User("22", name="v1"))
+    second = await orm.get_user_persist_id(basic, User("23", name="v1"))
+    await orm.get_user_persist_id(basic, User("22", name="v2"))
+
+    get_session = orm.get_session
+    gate = asyncio.Event()
+    calls = 0
+
+    @contextlib.asynccontextmanager
+    async def gated():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await gate.wait()
+        async with get_session() as db_session:
+            yield db_session
+
+    monkeypatch.setattr(orm, "get_session", gated)
+    flush1 = asyncio.create_task(write_behind.flush())
+    while not calls:
+        await asyncio.sleep(0)
+    await orm.get_user_persist_id(basic, User("23", name="v2"))
+    flush2 = asyncio.create_task(write_behind.flush())
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+    # 第二次写入需等待第一批写入完成，不能覆盖正在写入的批次
+    assert calls == 1
+    assert first in write_behind._flushing[orm.UserModel]
+    gate.set()
+    assert await asyncio.gather(flush1, flush2) == [True, True]
+    assert write_behind._flushing == {}
+    monkeypatch.setattr(orm, "get_session", get_session)
+    assert (await orm.get_user_model(first)).user_data["name"] == "v2"
+    assert (await orm.get_user_model(second)).user_data["name"] == "v2"
+
+
+@pytest.mark.parametrize("path", ["upsert", "fallback"])
+async def test_concurrent_first_sight_returns_single_id(monkeypatch, basic, path: str):
+    import asyncio
+
+    from nonebot_plugin_uninfo import Scene, SceneType, User, orm
+
+    if path == "fallback":
+
+        async def unsupported(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(orm, "_upsert", unsupported)
+    orm.clear_persist_id_cache()
+    user_ids = await asyncio.gather(*(orm.get_user_persist_id(basic, User(path)) for _ in range(20)))
+    scene_ids = await asyncio.gather(
+        *(orm.get_scene_persist_id(basic, Scene(path, SceneType.GROUP)) for _ in range(20))
+    )
+    assert len(set(user_ids)) == 1
+    assert len(set(scene_ids)) == 1
+    orm.clear_persist_id_cache()
+
+
+async def test_sync_scenes_three_levels(basic):
+    from nonebot_plugin_uninfo import Scene, SceneType, orm
+
+    guild = Scene("40", SceneType.GUILD, name="guild")
+    category = Scene("41", SceneType.CHANNEL_CATEGORY, name="category", parent=guild)
+    channel = Scene("42", SceneType.CHANNEL_TEXT, name="channel", parent=category)
+    result = await orm.sync_scenes(basic, [channel, category, guild])
+    assert len(result) == 3
+
+    models = {key: await orm.get_scene_model(persist_id) for key, persist_id in result.items()}
+    assert models[(SceneType.GUILD.value, "40")].parent_scene_persist_id is None
+    assert models[(SceneType.CHANNEL_CATEGORY.value, "41")].parent_scene_persist_id == result[(2, "40")]
+    assert models[(SceneType.CHANNEL_TEXT.value, "42")].parent_scene_persist_id == result[(4, "41")]
+    assert (await models[(3, "42")].to_scene()).parent.id == "41"  # type: ignore
+
+
+async def test_sync_scenes_keeps_existing_parent(basic):
+    from nonebot_plugin_uninfo import Scene, SceneType, orm
+
+    guild_id = await orm.get_scene_persist_id(basic, Scene("50", SceneType.GUILD, name="guild"))
+    stub = Scene("50", SceneType.GUILD)
+    result = await orm.sync_scenes(basic, [Scene("51", SceneType.CHANNEL_TEXT, name="channel", parent=stub)])
+    assert result[(SceneType.GUILD.value, "50")] == guild_id
+    assert (await orm.get_scene_model(guild_id)).scene_data["name"] == "guild"
+    assert (await orm.get_scene_model(result[(3, "51")])).parent_scene_persist_id == guild_id
+
+    # 未写入过的父级场景仍以占位数据写入
+    result = await orm.sync_scenes(basic, [Scene("53", SceneType.CHANNEL_TEXT, parent=Scene("52", SceneType.GUILD))])
+    assert (await orm.get_scene_model(result[(3, "53")])).parent_scene_persist_id == result[(2, "52")]
+
+
+async def test_collect_stale_sessions(basic):
+    import time
+
+    from nonebot_plugin_orm import get_session
+    from sqlalchemy import select, update
+
+    from nonebot_plugin_uninfo import Scene, SceneType, Session, User, orm
+
+    ids = [
+        await orm.get_session_persist_id(Session(**basic, scene=Scene("60", SceneType.GROUP), user=User(f"6{i}")))
+        for i in range(3)
+    ]
+    async with get_session() as db_session:
+        await db_session.execute(update(orm.SessionModel).where(orm.SessionModel.id.in_(ids)).values(last_seen=0))
+        await db_session.commit()
+
+    batches: list[set[int]] = []
+
+    async def archive(models):
+        # 之前批次删除的会话应已从持久化 id 缓存中移除
+        cached = {persist_id for persist_id, _ in orm._session_ids._data.values()}
+        assert not cached & set().union(*batches)
+        batches.append({model.id for model in models})
+        if len(batches) == 1:
+            # 归档期间再次出现的会话不应被删除
+            await orm._update_by_persist_id(orm.SessionModel, models[0].id, last_seen=int(time.time()))
+
+    assert await orm.collect_stale_sessions(60, batch_size=2, pause=0, archive=archive) == 2
+    assert [len(batch) for batch in batches] == [2, 1]
+    async with get_session() as db_session:
+        remaining = set(await db_session.scalars(select(orm.SessionModel.id).where(orm.SessionModel.id.in_(ids))))
+    assert len(remaining) == 1
+    assert remaining <= batches[0]
+
+
+async def test_touch_session_without_write_behind(basic):
+    from nonebot_plugin_uninfo import Scene, SceneType, Session, User, orm
+
+    session = Session(**basic, scene=Scene("70", SceneType.GROUP), user=User("70"))
+    persist_id = await orm.get_session_persist_id(session)
+    await orm._update_by_persist_id(orm.SessionModel, persist_id, last_seen=0)
+    orm._last_seen.pop(persist_id, None)
+
+    assert await orm.get_session_persist_id(session) == persist_id
+    assert len(orm._write_behind) == 0
+    assert (await orm.get_session_model(persist_id)).last_seen > 0
+
+
+@pytest.mark.parametrize("path", ["upsert", "fallback"])
+async def test_cached_session_persist_runs_no_query(monkeypatch, basic, statements: list[str], path: str):
+    from nonebot_plugin_uninfo import Member, Scene, SceneType, Session, User, orm
+
+    if path == "fallback":
+
+        async def unsupported(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(orm, "_upsert", unsupported)
+    user = User("70", name=path)
+    sess = Session(**basic, scene=Scene(path, SceneType.GROUP), user=user, member=Member(user, nick="nick"))
+    orm.clear_persist_id_cache()
+    persist_id = await orm.get_session_persist_id(sess)
+
+    statements.clear()
+    assert await orm.get_session_persist_id(sess) == persist_id
+    assert await orm.get_session_persist_id(sess) == persist_id
+    # 缓存命中且 last_seen 未到更新间隔时，既不查询也不写入
+    assert statements == []
+    orm.clear_persist_id_cache()
+
+
+async def test_to_sessions_matches_to_session(basic, statements: list[str]):
+    from nonebot_plugin_uninfo import Member, Scene, SceneType, Session, User, orm
+
+    guild = Scene("80", SceneType.GUILD, name="guild")
+    scenes = [
+        Scene("80", SceneType.GROUP, name="group"),
+        Scene("81", SceneType.CHANNEL_TEXT, name="text", parent=guild),
+        Scene("82", SceneType.CHANNEL_VOICE, name="voice", parent=guild),
+    ]
+    models = []
+    for i in range(9):
+        user = User(f"8{i}", name=f"user{i}")
+        member = Member(user, nick=f"nick{i}") if i % 2 else None
+        persist_id = await orm.get_session_persist_id(
+            Session(**basic, scene=scenes[i % len(scenes)], user=user, member=member)
+        )
+        models.append(await orm.get_session_model(persist_id))
+
+    expected = [await model.to_session() for model in models]
+    statements.clear()
+    assert await orm.to_sessions(models) == expected
+    queries = len(statements)
+
+    # 查询次数与记录数无关
+    statements.clear()
+    assert await orm.to_sessions(models[:2]) == expected[:2]
+    assert len(statements) == queries
+
+
+async def test_keyset_iteration(basic):
+    from sqlalchemy import select
+
+    from nonebot_plugin_uninfo import User, orm
+
+    basic = {**basic, "self_id": "900"}
+    bot_persist_id = await orm.get_bot_persist_id(basic)
+    assert [model async for model in orm.iter_user_models(bot_persist_id, batch_size=3)] == []
+
+    ids = [await orm.get_user_persist_id(basic, User(f"90{i}")) for i in range(7)]
+    statement = select(orm.UserModel).where(orm.UserModel.bot_persist_id == bot_persist_id)
+    pages = [page async for page in orm._iter_keyset(statement, orm.UserModel.id, 3)]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [model.id for page in pages for model in page] == sorted(ids)
+    assert [model.id async for model in orm.iter_user_models(bot_persist_id, batch_size=7)] == sorted(ids)
+
+
+async def test_keyset_iteration_with_concurrent_insert(basic):
+    from nonebot_plugin_uninfo import User, orm
+
+    basic = {**basic, "self_id": "901"}
+    bot_persist_id = await orm.get_bot_persist_id(basic)
+    ids = [await orm.get_user_persist_id(basic, User(f"91{i}")) for i in range(5)]
+
+    seen = []
+    async for model in orm.iter_user_models(bot_persist_id, batch_size=2):
+        if not seen:
+            ids.append(await orm.get_user_persist_id(basic, User("919")))
+        seen.append(model.id)
+    # 已有记录恰好各出现一次，迭代期间新增的记录位于末尾，同样会被读取
+    assert seen == sorted(ids)
+
+
+async def test_query_sessions_isolates_failures(monkeypatch, basic):
+    from nonebot.log import logger
+
+    from nonebot_plugin_uninfo import Scene, SceneType, Session, User, orm
+
+    models = []
+    for i in range(3):
+        persist_id = await orm.get_session_persist_id(
+            Session(**basic, scene=Scene("93", SceneType.GROUP), user=User(f"93{i}"))
+        )
+        models.append(await orm.get_session_model(persist_id))
+
+    async def query_session(stored: Session):
+        if stored.user.id == "931":
+            raise RuntimeError("api is down")
+        return stored
+
+    monkeypatch.setattr(orm, "_query_session", query_session)
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        results = await orm.query_sessions(models, concurrency=2)
+    finally:
+        logger.remove(handler_id)
+    assert [sess.user.id if sess else None for sess in results] == ["930", None, "932"]
+    assert len(messages) == 1
+    assert "api is down" in messages[0]
@@ -0,0 +1,87 @@
+from nonebot.adapters.onebot.v11 import Bot
+import pytest
+
+from tests.conftest import make_group_event, make_private_event
+
+
+class FakeSession:
+    def __init__(self, scene_type, scene_id: str = "99", user_id: str = "10", roles=()):
+        from nonebot_plugin_uninfo import Member, Role, Scene, User
+
+        self.scene = Scene(scene_id, scene_type)
+        self.user = User(user_id)
+        self.member = Member(self.user, roles=[Role(role, level) for role, level in roles])
+        self.member_calls = 0
+
+    async def get_member(self):
+        self.member_calls += 1
+        return self.member
+
+
+async def test_perm_operators():
+    from nonebot_plugin_uninfo import Perm, SceneType
+
+    sess = FakeSession(SceneType.GROUP, roles=[("ADMINISTRATOR", 10)])
+    assert await (Perm.group() & Perm.role_in("ADMINISTRATOR")).optimize().evaluate(sess)  # type: ignore
+    assert not await (Perm.private() & Perm.role_in("ADMINISTRATOR")).optimize().evaluate(sess)  # type: ignore
+    assert await (Perm.private() | Perm.user_in("10")).optimize().evaluate(sess)  # type: ignore
+    assert not await (Perm.private() | Perm.scene_in("1")).optimize().evaluate(sess)  # type: ignore
+    assert await (~Perm.private()).optimize().evaluate(sess)  # type: ignore
+    assert not await (~~Perm.private()).optimize().evaluate(sess)  # type: ignore
+    assert await Perm.role_level(lambda level: level >= 10).optimize().evaluate(sess)  # type: ignore
+
+
+async def test_perm_cheap_checks_first():
+    from nonebot_plugin_uninfo import Perm, SceneType
+
+    sess = FakeSession(SceneType.PRIVATE, roles=[("OWNER", 100)])
+    expr = (Perm.role_in("OWNER") & Perm.group()).optimize()
+    assert not await expr.evaluate(sess)  # type: ignore
+    assert sess.member_calls == 0
+
+    expr = (Perm.role_level(lambda level: level > 0) | Perm.user_in("10")).optimize()
+    assert await expr.evaluate(sess)  # type: ignore
+    assert sess.member_calls == 0
+
+
+async def test_perm_compile_skips_member_fetch(bot: Bot, fetcher, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_uninfo import Member, Perm, Role, User
+
+    calls = []
+
+    async def query_member(bot, scene_type, parent_scene_id, user_id):
+        calls.append(user_id)
+        return Member(User(user_id), roles=[Role("ADMINISTRATOR", 10)])
+
+    monkeypatch.setattr(fetcher, "query_member", query_member)
+
+    permission = (Perm.role_in("ADMINISTRATOR") & Perm.scene_in("1")).compile()
+    assert not await permission(bot, make_group_event(group_id=99))
+    assert calls == []
+
+    permission = (Perm.role_in("ADMINISTRATOR") & Perm.group()).compile()
+    assert await permission(bot, make_group_event(group_id=99))
+    assert calls == ["10"]
+
+
+async def test_shallow_permissions_without_api(app, monkeypatch: pytest.MonkeyPatch):
+    from nonebot.adapters.onebot.v11 import Adapter
+    from nonebot.adapters.onebot.v11 import Bot as V11Bot
+
+    from nonebot_plugin_uninfo.permission import GROUP, PRIVATE, SCENE_IN, USER_IN
+
+    # 未声明任何 API 调用，若权限检查触发完整获取则测试失败
+    async with app.test_api() as ctx:
+        adapter = ctx.create_adapter(base=Adapter)
+        # nonebug 的虚拟适配器名为 fake，需还原为真实名称才能找到对应的 fetcher
+        monkeypatch.setattr(adapter, "get_name", Adapter.get_name)
+        bot = ctx.create_bot(base=V11Bot, adapter=adapter, self_id="123")
+        group_event = make_group_event()
+        private_event = make_private_event()
+        assert await GROUP(bot, group_event)
+        assert not await PRIVATE(bot, group_event)
+        assert await PRIVATE(bot, private_event)
+        assert not await GROUP(bot, private_event)
+        assert await USER_IN("10")(bot, group_event)
+        assert not await USER_IN("11")(bot, private_event)
+        assert await SCENE_IN("99")(bot, group_event)
@@ -0,0 +1,22 @@
+def test_pool_requires_frozen_cache(monkeypatch, fetcher):
+    from nonebot_plugin_uninfo import fetch
+
+    monkeypatch.setattr(fetch.conf, "uninfo_intern", True)
+    monkeypatch.setattr(fetch.conf, "uninfo_cache_frozen", False)
+    assert type(fetcher)(fetcher.adapter).pool is None
+
+    monkeypatch.setattr(fetch.conf, "uninfo_cache_frozen", True)
+    assert type(fetcher)(fetcher.adapter).pool is not None
+
+
+def test_pool_shares_frozen_instances():
+    from nonebot_plugin_uninfo import Member, Role, User
+    from nonebot_plugin_uninfo.pool import InternPool
+
+    pool = InternPool()
+    first = pool.member(Member(User("1", name="a"), roles=[Role("r")]).freeze())
+    second = pool.member(Member(User("1", name="a"), roles=[Role("r")]).freeze())
+    assert first.user is second.user
+    assert first.roles[0] is second.roles[0]
+    assert first.frozen
+    assert first.user.frozen
@@ -0,0 +1,49 @@
+import pytest
+
+from .conftest import make_group_event
+
+
+@pytest.fixture
+async def cached_event(fetcher, basic):
+    from nonebot_plugin_uninfo import Scene, SceneType, Session, User
+
+    event = make_group_event()
+    sess = Session(**basic, scene=Scene("99", SceneType.GROUP), user=User("10"))
+    fetcher.restore_cache("session", "123", fetcher.get_session_id(event), sess, 60)
+    return event
+
+
+async def test_prefetch_adapter_filter(bot, fetcher, cached_event, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_uninfo.fetch import conf
+    from nonebot_plugin_uninfo.prefetch import prefetch_session
+
+    monkeypatch.setattr(conf, "uninfo_prefetch_adapters", {"Telegram"})
+    await prefetch_session(bot, cached_event)
+    assert fetcher._get_event_task(cached_event) is None
+
+    monkeypatch.setattr(conf, "uninfo_prefetch_adapters", {"OneBot V11"})
+    await prefetch_session(bot, cached_event)
+    assert (task := fetcher._get_event_task(cached_event))
+    assert (await task).scene.id == "99"
+
+
+async def test_prefetch_event_type_filter(bot, fetcher, cached_event, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_uninfo.fetch import conf
+    from nonebot_plugin_uninfo.prefetch import prefetch_session
+
+    monkeypatch.setattr(conf, "uninfo_prefetch_event_types", {"notice"})
+    await prefetch_session(bot, cached_event)
+    assert fetcher._get_event_task(cached_event) is None
+
+    monkeypatch.setattr(conf, "uninfo_prefetch_event_types", {"notice", "message"})
+    await prefetch_session(bot, cached_event)
+    assert fetcher._get_event_task(cached_event)
+
+
+async def test_prefetch_without_fetcher(bot, fetcher, cached_event, monkeypatch: pytest.MonkeyPatch):
+    from nonebot_plugin_uninfo.prefetch import prefetch_session
+
+    monkeypatch.setattr(bot.adapter, "get_name", lambda: "Unknown")
+    with pytest.warns(RuntimeWarning, match="Unknown"):
+        await prefetch_session(bot, cached_event)
+    assert not fetcher._event_tasks
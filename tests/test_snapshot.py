@@ -0,0 +1,94 @@
+from io import BytesIO
+
+
+def _fill(fetcher):
+    from nonebot_plugin_uninfo import User
+
+    for i in range(3):
+        fetcher.restore_cache("user", "123", str(i), User(str(i), name=f"user{i}"), 60)
+
+
+async def test_snapshot_round_trip(fetcher):
+    from nonebot_plugin_uninfo.snapshot import dump_snapshot, load_snapshot
+
+    _fill(fetcher)
+    fp = BytesIO()
+    assert dump_snapshot(fetcher, fp) == 3
+    fetcher.clean()
+    fp.seek(0)
+    assert load_snapshot(fetcher, fp) == 3
+    assert fetcher._user_cache["123"]["1"].name == "user1"
+
+
+async def test_snapshot_stops_at_truncated_record(fetcher):
+    from nonebot_plugin_uninfo.snapshot import _RECORD, dump_snapshot, load_snapshot
+
+    _fill(fetcher)
+    fp = BytesIO()
+    dump_snapshot(fetcher, fp)
+    data = fp.getvalue()
+    fetcher.clean()
+    assert load_snapshot(fetcher, BytesIO(data[:-1])) == 2
+    fetcher.clean()
+    last_header = data.rfind(b"[") - _RECORD.size
+    assert load_snapshot(fetcher, BytesIO(data[: last_header + 1])) == 2
+
+
+async def test_restore_cache_respects_cache_switch(monkeypatch, fetcher):
+    from nonebot_plugin_uninfo import fetch
+
+    monkeypatch.setattr(fetch.conf, "uninfo_cache", False)
+    _fill(fetcher)
+    assert not fetcher._user_cache
+    assert not fetcher._timertasks
+
+
+async def test_snapshot_round_trip_all_kinds(fetcher):
+    from datetime import datetime
+
+    from nonebot_plugin_uninfo import Member, Role, Scene, SceneType, Session, SupportAdapter, SupportScope, User
+    from nonebot_plugin_uninfo.snapshot import dump_snapshot, load_snapshot
+
+    user = User("10", name="user", avatar="https://example.com/avatar.png")
+    guild = Scene("1", SceneType.GUILD, name="guild")
+    channel = Scene("2", SceneType.CHANNEL_TEXT, name="channel", parent=guild)
+    member = Member(user, nick="nick", joined_at=datetime(2024, 1, 1), roles=[Role("ADMINISTRATOR", 10, "admin")])
+    sess = Session("123", SupportAdapter.onebot11, SupportScope.qq_client, channel, user, member=member)
+    entries = {
+        "scene": ((channel.type.value, channel.id, guild.id), channel),
+        "member": ((channel.type.value, guild.id, user.id), member),
+        "session": (sess.id, sess),
+    }
+    for kind, (key, value) in entries.items():
+        fetcher.restore_cache(kind, "123", key, value, 60)
+
+    fp = BytesIO()
+    assert dump_snapshot(fetcher, fp) == 3
+    fetcher.clean()
+    fp.seek(0)
+    assert load_snapshot(fetcher, fp) == 3
+    for kind, (key, value) in entries.items():
+        assert fetcher._get_cache(kind, "123", key) == value
+
+
+async def test_snapshot_rejects_corrupt_records(fetcher):
+    from nonebot_plugin_uninfo.snapshot import _RECORD, MAGIC, dump_snapshot, load_snapshot
+
+    _fill(fetcher)
+    fp = BytesIO()
+    dump_snapshot(fetcher, fp)
+    data = fp.getvalue()
+    start = len(MAGIC) + 8
+    _, _, length = _RECORD.unpack_from(data, start)
+    payload = start + _RECORD.size
+
+    # 负载损坏的记录被跳过，其余记录照常恢复
+    fetcher.clean()
+    corrupt = data[:payload] + b"{" * length + data[payload + length :]
+    assert load_snapshot(fetcher, BytesIO(corrupt)) == 2
+    assert "0" not in fetcher._user_cache["123"]
+
+    # 记录头损坏时之后的记录都不再读取
+    fetcher.clean()
+    corrupt = data[:start] + b"\xff" + data[start + 1 :]
+    assert load_snapshot(fetcher, BytesIO(corrupt)) == 0
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+
+def make_members():
+    from nonebot_plugin_uninfo import Member, MuteInfo, Role, User
+
+    return [
+        Member(
+            User("1"),
+            nick="owner",
+            joined_at=datetime(2024, 1, 1, 8, 30),
+            roles=[Role("MEMBER", 1), Role("OWNER", 100)],
+        ),
+        Member(User("2"), mute=MuteInfo(True, timedelta(minutes=10))),
+        Member(User("3"), nick="muted before", mute=MuteInfo(False, timedelta(0))),
+    ]
+
+
+async def test_member_table_rows():
+    from nonebot_plugin_uninfo import MemberRow, MemberTable
+
+    members = make_members()
+
+    async def stream():
+        for member in members:
+            yield member
+
+    table = await MemberTable.collect(stream())
+    assert len(table) == len(members)
+    assert table[0] == MemberRow("1", "owner", datetime(2024, 1, 1, 8, 30), 100, False)
+    assert table[1] == MemberRow("2", None, None, 0, True)
+    assert table[-1].nick == "muted before"
+    assert not table[-1].muted
+
+    rows = list(table)
+    assert rows == [table[i] for i in range(len(table))]
+    for row, member in zip(rows, members):
+        assert row.id == member.id
+        assert row.nick == member.nick
+        assert row.joined_at == member.joined_at
+        assert row.role_level == (member.role.level if member.role else 0)
+        assert row.muted == bool(member.mute and member.mute.muted)
+
+
+def test_member_table_to_members():
+    from nonebot_plugin_uninfo import Member, MemberTable
+
+    members = make_members()
+    table = MemberTable()
+    for member in members:
+        table.append(member)
+    expected = [Member(member.user, nick=member.nick, joined_at=member.joined_at) for member in members]
+    assert table.to_members() == expected